@@ -41,7 +41,9 @@ import logging
 import gc
 import glob
 import unicodedata
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from types import MappingProxyType
 from datetime import date, datetime, timedelta
 from typing import List, Dict, Any, Optional, Union, Callable, Tuple
 from matplotlib.pylab import sample
@@ -126,16 +128,50 @@ SCHEMAS = {
 }
 
 # --- Helpers ---
-def guardar_parquet(df: pl.DataFrame, nombre_archivo: str):
-    """Guarda DataFrame en formato Parquet estándar."""
+# Overrides de escritura Parquet por tabla (las dims pequeñas usan los defaults: un solo row group).
+# "row_group_bytes" se traduce a row_group_size según el tamaño promedio de fila del DataFrame.
+PARQUET_OPCIONES_POR_TABLA = {
+    "dim_cliente": {
+        "compression_level": 3,
+        "row_group_bytes": 256_000_000,
+        "statistics": True,  # pushdown en filtros futuros por Ano_Creacion
+    },
+}
+
+
+def guardar_parquet(df: pl.DataFrame | pl.LazyFrame, nombre_archivo: str) -> Path:
+    """Guarda DataFrame en formato Parquet estándar (ZSTD + overrides por tabla) y devuelve la ruta.
+
+    Si recibe un LazyFrame lo escribe en streaming con sink_parquet (sin materializar).
+    """
     try:
         ruta = DIRS["OUTPUT"] / f"{nombre_archivo}.parquet"
-        df.write_parquet(ruta, compression="zstd")
+        opciones = dict(PARQUET_OPCIONES_POR_TABLA.get(nombre_archivo, {}))
+        opciones.setdefault("compression_level", 3)
+
+        if isinstance(df, pl.LazyFrame):
+            opciones.pop("row_group_bytes", None)
+            opciones.setdefault("statistics", False)
+            # Orden estable: las dimensiones se releen con scan_parquet y se muestrean por posición con rng sembrado
+            df.sink_parquet(ruta, compression="zstd", maintain_order=True, **opciones)
+            logger.info(f"💾 Archivo guardado (streaming): {ruta}")
+            return ruta
+
+        row_group_bytes = opciones.pop("row_group_bytes", None)
+        if row_group_bytes and df.height > 0:
+            avg_row_bytes = max(1, df.estimated_size() // df.height)
+            opciones["row_group_size"] = max(1, row_group_bytes // avg_row_bytes)
+
+        df.write_parquet(ruta, compression="zstd", **opciones)
         logger.info(f"💾 Archivo guardado: {ruta} ({df.height:,} filas)")
+        return ruta
     except Exception as e:
         logger.error(f"❌ Error guardando {nombre_archivo}: {e}")
         raise
 
+# Caché global de strings: los IDs Categorical de distintas dimensiones comparten códigos
+pl.enable_string_cache()
+
 logger.info("🚀 Entorno OOM-Safe inicializado.")
 
 
@@ -1200,6 +1236,21 @@ total_peso_geo = sum([p["Peso"] for p in PROVINCIAS_FLAT])
 if not math.isclose(total_peso_geo, 1.0, abs_tol=0.05):
     logger.warning(f"⚠️ Pesos geográficos suman {total_peso_geo:.2f}, se renormalizarán en la función.")
 
+# DataFrame base de provincias construido una sola vez (schema explícito, sin inferencia por llamada)
+_PROVINCIAS_DF = pl.DataFrame(
+    PROVINCIAS_FLAT,
+    schema={
+        "ID_Provincia": pl.Utf8,
+        "Nombre_Provincia": pl.Utf8,
+        "Region": pl.Utf8,
+        "Poblacion_Estimada": pl.Int32,
+        "Area_Km2": pl.Float32,
+        "Lat": pl.Float32,
+        "Lon": pl.Float32,
+        "Peso": pl.Float32,
+    },
+)
+
 
 
 
@@ -1307,6 +1358,10 @@ FACTOR_ESTACIONALIDAD_MENSUAL = {
     11: 1.10,
     12: 1.40,
 }
+# LUT float32 indexada directamente por número de mes (posición 0 sin uso)
+LUT_FACTOR_ESTACIONALIDAD_MENSUAL = np.array(
+    [1.0] + [FACTOR_ESTACIONALIDAD_MENSUAL[m] for m in range(1, 13)], dtype=np.float32
+)
 
 
 
@@ -1335,6 +1390,24 @@ FECHA_INICIO_PROYECTO = date(2021, 1, 1)
 FECHA_FIN_PROYECTO = date(2026, 12, 31)
 SEED_VAL = 42 # Semilla para reproducibilidad
 
+# Faker singleton compartido por los generadores: los providers del locale se cargan una sola vez.
+Faker.seed(SEED_VAL)
+_FAKER_ES = Faker("es_ES")
+
+# Streams PCG64 independientes por generador (SeedSequence.spawn): reproducibles y sin
+# correlación entre dimensiones aunque se ejecuten en paralelo.
+_GENERADORES_CON_RNG = [
+    "DimGeografia", "DimDepartamento", "DimCliente", "DimEmpleado",
+    "DimVendedor", "DimVehiculo", "DimRuta",
+]
+SEMILLAS_DIMENSION = dict(
+    zip(_GENERADORES_CON_RNG, np.random.SeedSequence(SEED_VAL).spawn(len(_GENERADORES_CON_RNG)))
+)
+
+
+def rng_dimension(nombre_dim: str) -> np.random.Generator:
+    return np.random.default_rng(SEMILLAS_DIMENSION[nombre_dim])
+
 # Esquemas de ejemplo (deberían estar definidos en tu archivo de configuración)
 SCHEMAS = {
     "DimTiempo": pl.Schema({
@@ -1380,7 +1453,7 @@ SCHEMAS = {
         "Provincia": pl.Utf8,
         "Latitud": pl.Float32,
         "Longitud": pl.Float32,
-        "Capacidad_Produccion_LtsDia": pl.Int64,
+        "Capacidad_Produccion_LtsDia": pl.Int32,
         "Fecha_Inicio_Operaciones": pl.Date,
         "Estado_Operativo": pl.Utf8,
         "Certificaciones": pl.Utf8,
@@ -1403,7 +1476,7 @@ SCHEMAS = {
         "Nombre_Departamento": pl.Utf8,
         "Tipo_Departamento": pl.Utf8,
         "Nivel_Organizacional": pl.Utf8,
-        "Presupuesto_Anual_Estimado_DOP": pl.Float64,
+        "Presupuesto_Anual_Estimado_DOP": pl.Float32,
         "Numero_Empleados_Estimado": pl.Int32,
         "Objetivo_Principal": pl.Utf8,
     }),
@@ -1412,9 +1485,9 @@ SCHEMAS = {
         "Departamento_ID": pl.Utf8,                 # FK → DimDepartamento.Departamento_ID
         "Nombre_Puesto": pl.Utf8,
         "Nivel_Puesto": pl.Utf8,
-        "Salario_Base_Mensual_Min_DOP": pl.Float64,
-        "Salario_Base_Mensual_Max_DOP": pl.Float64,
-        "Salario_Base_Mensual_DOP": pl.Float64,     # promedio de referencia
+        "Salario_Base_Mensual_Min_DOP": pl.Float32,
+        "Salario_Base_Mensual_Max_DOP": pl.Float32,
+        "Salario_Base_Mensual_DOP": pl.Float32,     # promedio de referencia
         "Es_Comercial": pl.Boolean,
     }),
     "DimCEDIS": pl.Schema({
@@ -1468,7 +1541,7 @@ SCHEMAS = {
     }),
     
     "DimCliente": pl.Schema({
-        "ID_Cliente": pl.Utf8,          # Clave surrogate cliente
+        "ID_Cliente": pl.UInt32,        # Clave surrogate cliente (entero también en el parquet y en FactVentas)
         "Nombre_Cliente": pl.Utf8,
         "ID_Provincia": pl.Utf8,        # FK → DimGeografia.ID_Provincia
         "ID_Canal": pl.Utf8,            # FK → DimCanalDistribucion.ID_Canal
@@ -1530,7 +1603,7 @@ SCHEMAS = {
         "Costo_Fijo_Operativo_Diario_DOP": pl.Float32,
         "Uso_Principal": pl.Utf8,                    # Rutas Largas, Urbano, etc.
         "Anio_Fabricacion": pl.Int16,
-        "Kilometraje_Actual_KM": pl.Int64,
+        "Kilometraje_Actual_KM": pl.Int32,
         "Estado_Vehiculo": pl.Utf8,                  # Operativo, En Taller, Baja
         "Tiene_GPS": pl.Boolean,
         "Valor_Adquisicion_DOP": pl.Float32,
@@ -1620,20 +1693,21 @@ SCHEMAS = {
         "Numero_Serie": pl.Utf8,
     }),
 
+    # Llaves foráneas y dominios cerrados como Categorical (un u32 por fila; códigos compartidos vía string cache)
     "FactVentas":pl.Schema({
         "ID_Venta_Transaccion": pl.Utf8,
-        "ID_Factura": pl.Utf8,
+        "ID_Factura": pl.Categorical,
         "Fecha_Transaccion": pl.Date,
         "ID_Tiempo": pl.Utf8, # FK a DimTiempo
-        "ID_Cliente": pl.Utf8,
-        "Vendedor_ID": pl.Utf8,
-        "ID_CEDI_Origen": pl.Utf8, # Nuevo: CEDI que despacha
-        "ID_Ruta": pl.Utf8,
-        "ID_Vehiculo": pl.Utf8,
-        "Codigo_Producto_SKU": pl.Utf8,
-        "ID_Promocion": pl.Utf8, # Nuevo: Promoción aplicada
-        "ID_Canal": pl.Utf8, # Nuevo: Canal de venta
-        "ID_Provincia": pl.Utf8, # Nuevo: Provincia de la venta
+        "ID_Cliente": pl.UInt32, # FK surrogate a DimCliente
+        "Vendedor_ID": pl.Categorical,
+        "ID_CEDI_Origen": pl.Categorical, # Nuevo: CEDI que despacha
+        "ID_Ruta": pl.Categorical,
+        "ID_Vehiculo": pl.Categorical,
+        "Codigo_Producto_SKU": pl.Categorical,
+        "ID_Promocion": pl.Categorical, # Nuevo: Promoción aplicada
+        "ID_Canal": pl.Categorical, # Nuevo: Canal de venta
+        "ID_Provincia": pl.Categorical, # Nuevo: Provincia de la venta
         "Cantidad_Unidades": pl.Int32,
         "Precio_Unitario_DOP": pl.Float32, # Precio antes de descuento
         "Precio_Final_DOP": pl.Float32, # Precio por unidad después de descuento y promoción
@@ -1646,12 +1720,12 @@ SCHEMAS = {
         "Ingreso_Bruto_DOP": pl.Float32, # Cantidad * Precio Unitario (antes de descuentos e impuestos)            "Ingreso_Neto_DOP": pl.Float32, # Total facturado al cliente (después de descuentos, antes de ITBIS)
         "Costo_Venta_Total_DOP": pl.Float32,
         "Margen_Bruto_DOP": pl.Float32,
-        "Tipo_Pago": pl.Utf8,
-        "Medio_Pago": pl.Utf8,
-        "Estado_Factura": pl.Utf8,
+        "Tipo_Pago": pl.Categorical,
+        "Medio_Pago": pl.Categorical,
+        "Estado_Factura": pl.Categorical,
         "Latitud_Entrega": pl.Float32, # Nuevo: Latitud del cliente
         "Longitud_Entrega": pl.Float32, # Nuevo: Longitud del cliente
-        "Tipo_Venta": pl.Utf8, # Nuevo: Preventa, Autoventa, Directa
+        "Tipo_Venta": pl.Categorical, # Nuevo: Preventa, Autoventa, Directa
         "Ticket_Promedio_Cliente": pl.Float32 # Nuevo: Estimación de ticket promedio de ese cliente para la fecha
     }),
     
@@ -1753,12 +1827,21 @@ if 'guardar_parquet' not in globals():
         logger.info(f"    💾 Guardado {name}.parquet en {path}")
 
 # Función auxiliar para asegurar columnas y tipos
-def asegurar_columnas(df: pl.DataFrame, schema: pl.Schema, valores_defecto: dict = None) -> pl.DataFrame:
+def asegurar_columnas(
+    df: pl.DataFrame | pl.LazyFrame, schema: pl.Schema, valores_defecto: dict = None
+) -> pl.DataFrame | pl.LazyFrame:
+    # Acepta DataFrame o LazyFrame (en lazy se añade al plan sin materializar)
+    esquema_actual = df.collect_schema()
+
+    # Caso común: todas las columnas ya existen -> solo reordenar (el cast lo hace asegurar_schema)
+    if set(esquema_actual.names()) >= set(schema.keys()):
+        return df.select(list(schema.keys()))
+
     if valores_defecto is None:
         valores_defecto = {}
     
     for col, dtype in schema.items():
-        if col not in df.columns:
+        if col not in esquema_actual:
             default_value = valores_defecto.get(col)
             if default_value is None:
                 if dtype == pl.Utf8:
@@ -1775,20 +1858,42 @@ def asegurar_columnas(df: pl.DataFrame, schema: pl.Schema, valores_defecto: dict
             df = df.with_columns(pl.lit(default_value, dtype=dtype).alias(col))
         else:
             # Intentar castear si el tipo no coincide, pero solo si es compatible o es None
-            if df[col].dtype != dtype:
+            if esquema_actual[col] != dtype:
                 try:
                     df = df.with_columns(pl.col(col).cast(dtype))
                 except Exception as e:
-                    logger.warning(f"⚠️ No se pudo castear la columna '{col}' de {df[col].dtype} a {dtype}: {e}")
+                    logger.warning(f"⚠️ No se pudo castear la columna '{col}' de {esquema_actual[col]} a {dtype}: {e}")
                     # Si el casteo falla y la columna puede ser nula, la dejamos como está o la llenamos con nulos.
                     # Para este contexto, asumiremos que el esquema final es el que importa.
     
     # Seleccionar y reordenar columnas según el esquema
-    df = df.select([col for col in schema.keys() if col in df.columns])
+    df = df.select([col for col in schema.keys() if col in df.collect_schema()])
     
     return df
 
 
+# Función auxiliar para castear al schema solo cuando hace falta
+def asegurar_schema(df: pl.DataFrame | pl.LazyFrame, schema: pl.Schema) -> pl.DataFrame | pl.LazyFrame:
+    if df.collect_schema() == schema:
+        return df
+    return df.cast(dict(schema))  # type: ignore[arg-type]
+
+
+def ids_secuenciales(prefijo: str, n: int, ancho: int, inicio: int = 1) -> pl.Series:
+    """IDs tipo 'PREF-0001' construidos en bloque con operaciones de texto de Polars."""
+    return prefijo + pl.Series(np.arange(inicio, inicio + n)).cast(pl.Utf8).str.zfill(ancho)
+
+
+def pool_textos_faker(generador: Callable[[], str], n: int) -> np.ndarray:
+    """Pool de valores Faker únicos (orden estable) para muestrear por índice en lote."""
+    return np.array(list(dict.fromkeys(generador() for _ in range(n))), dtype=object)
+
+
+def ids_categoricos(df: pl.DataFrame, columnas: list[str]) -> pl.LazyFrame:
+    """LazyFrame en memoria con las llaves indicadas como Categorical (el parquet persistido sigue en Utf8)."""
+    return df.lazy().with_columns([pl.col(c).cast(pl.Categorical) for c in columnas])
+
+
 
 
 # GRUPO 1 -- FUNCIONES GENERADORAS --
@@ -1855,26 +1960,27 @@ def generar_dim_tiempo() -> pl.LazyFrame:
         pl.col("Nombre_Feriado").fill_null("No Feriado"),
     ])
 
-    # Estacionalidad mensual base
+    # Estacionalidad mensual base: gather sobre la LUT float32 indexada por mes
     df = df.with_columns(
-        pl.col("Mes")
-          .replace(FACTOR_ESTACIONALIDAD_MENSUAL)
-          .cast(pl.Float32)
-          .alias("Factor_Estacionalidad_Mensual")
+        pl.Series(
+            "Factor_Estacionalidad_Mensual",
+            LUT_FACTOR_ESTACIONALIDAD_MENSUAL[df["Mes"].to_numpy()],
+            dtype=pl.Float32,
+        )
     )
 
-    # Impacto feriado (numpy)
-    fechas_eager    = df["Fecha"].to_numpy()
-    feriados_eager  = df["EsFeriado"].to_numpy()
-    impacto_feriado_arr = np.ones(len(fechas_eager), dtype=np.float32)
+    # Impacto feriado (numpy, sin ramas): feriado, víspera y día posterior por máscaras desplazadas
+    feriados_eager = df["EsFeriado"].to_numpy()
+    feriado_manana = np.zeros_like(feriados_eager)
+    feriado_manana[:-1] = feriados_eager[1:]
+    feriado_ayer = np.zeros_like(feriados_eager)
+    feriado_ayer[1:] = feriados_eager[:-1]
 
-    for i, is_f in enumerate(feriados_eager):
-        if is_f:
-            impacto_feriado_arr[i] *= IMPACTO_FERIADO["dia_feriado"]
-            if i > 0 and not feriados_eager[i - 1]:
-                impacto_feriado_arr[i - 1] *= IMPACTO_FERIADO["dia_antes"]
-            if i < len(fechas_eager) - 1 and not feriados_eager[i + 1]:
-                impacto_feriado_arr[i + 1] *= IMPACTO_FERIADO["dia_despues"]
+    impacto_feriado_arr = (
+        np.where(feriados_eager, IMPACTO_FERIADO["dia_feriado"], 1.0)
+        * np.where(~feriados_eager & feriado_manana, IMPACTO_FERIADO["dia_antes"], 1.0)
+        * np.where(~feriados_eager & feriado_ayer, IMPACTO_FERIADO["dia_despues"], 1.0)
+    ).astype(np.float32)
 
     df = df.with_columns(
         pl.Series("Factor_Impacto_Feriado", impacto_feriado_arr, dtype=pl.Float32)
@@ -1891,12 +1997,12 @@ def generar_dim_tiempo() -> pl.LazyFrame:
     if "DimTiempo" in SCHEMAS:
         schema = SCHEMAS["DimTiempo"]
         df = asegurar_columnas(df, schema)
-        df = df.cast(dict(schema))  # type: ignore[arg-type]
+        df = asegurar_schema(df, schema)
 
    # logger.info( "🔎 Sample de DimTiempo:\n" + df.head(10).to_pandas().to_string(index=False))
 
     guardar_parquet(df, "dim_tiempo")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_tiempo.parquet")
+    return df.lazy()
 
 
 # --------------------------------------------------------------------
@@ -1905,8 +2011,8 @@ def generar_dim_tiempo() -> pl.LazyFrame:
 def generar_dim_geografia() -> pl.LazyFrame:
     logger.info("    🌍 Generando DimGeografia (Completa con todos los atributos)...")
     
-    # 0. Cargar datos base (ajusta el rename si tu clave es distinta)
-    df = pl.DataFrame(PROVINCIAS_FLAT)
+    # 0. Cargar datos base (precalculados al importar; Polars no muta in-place, no hace falta clone)
+    df = _PROVINCIAS_DF
     # Si tu diccionario trae 'Nombre_Provincia', descomenta:
     # df = df.rename({"Nombre_Provincia": "Provincia"})
     
@@ -1918,7 +2024,7 @@ def generar_dim_geografia() -> pl.LazyFrame:
     
     # 2. Generar ID y métricas básicas
     df = df.with_row_index("idx", offset=1).with_columns([
-        (pl.lit("DO-") + pl.col("idx").cast(pl.Utf8).str.zfill(2)).alias("ID_Provincia"),
+        pl.format("DO-{}", pl.col("idx").cast(pl.Utf8).str.zfill(2)).alias("ID_Provincia"),
         (pl.col("Poblacion_Estimada") / pl.col("Area_Km2"))
             .round(1)
             .cast(pl.Float32)
@@ -1929,23 +2035,24 @@ def generar_dim_geografia() -> pl.LazyFrame:
     ])
     
     # 3. Asignar nivel socioeconómico predominante
-    rng = np.random.default_rng(SEED_VAL)
-    nse_asignado: list[str] = []
+    #    (un sorteo en lote por región, no por provincia)
+    rng = rng_dimension("DimGeografia")
+    regiones = df["Region"].to_numpy()
+    nse_asignado = np.empty(len(regiones), dtype=object)
     
-    for row in df.iter_rows(named=True):
-        region = row["Region"]
+    for region in dict.fromkeys(regiones):
         pesos_region = PESOS_NIVEL_SOCIOECONOMICO.get(
             region,
             PESOS_NIVEL_SOCIOECONOMICO["Ozama"],
         )
-        niveles = list(pesos_region.keys())
+        niveles = np.array(list(pesos_region.keys()), dtype=object)
         probs = np.array(list(pesos_region.values()), dtype=float)
         probs = probs / probs.sum()
-        nse = rng.choice(niveles, p=probs)
-        nse_asignado.append(nse)
+        mask_region = regiones == region
+        nse_asignado[mask_region] = rng.choice(niveles, size=int(mask_region.sum()), p=probs)
     
     df = df.with_columns(
-        pl.Series("Nivel_Socioeconomico", nse_asignado)
+        pl.Series("Nivel_Socioeconomico", nse_asignado, dtype=pl.Utf8)
     )
     
     # 4. Selección final
@@ -1966,10 +2073,10 @@ def generar_dim_geografia() -> pl.LazyFrame:
     if "DimGeografia" in SCHEMAS:
         schema = SCHEMAS["DimGeografia"]
         df_final = asegurar_columnas(df_final, schema)
-        df_final = df_final.cast(dict(schema))  # type: ignore[arg-type]
+        df_final = asegurar_schema(df_final, schema)
     
     guardar_parquet(df_final, "dim_geografia")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_geografia.parquet")
+    return df_final.lazy()
 
 # --------------------------------------------------------------------
 # 3. DimPlanta (Única Planta Principal)
@@ -1978,36 +2085,33 @@ def generar_dim_planta():
     logger.info("    🏭 Generando DimPlanta (Única Planta Principal)...")
     
     # Datos de la planta única basados en la información del proyecto
-    planta_data = [{
-        "ID_Planta": "PLN-01",
-        "Nombre_Planta": "Planta Principal Bepensa RD",
-        "Tipo_Planta": "Embotelladora y Producción Multicategoría",
+    df = pl.from_dict({
+        "ID_Planta": ["PLN-01"],
+        "Nombre_Planta": ["Planta Principal Bepensa RD"],
+        "Tipo_Planta": ["Embotelladora y Producción Multicategoría"],
         # Ubicación realista en zona industrial Haina
-        "Ubicacion_Municipio": "La Feria",
-        "Provincia": "Santo Domingo",
-        "Latitud": 18.44742855000376,
-        "Longitud": -69.93012206251315,
+        "Ubicacion_Municipio": ["La Feria"],
+        "Provincia": ["Santo Domingo"],
+        "Latitud": [18.44742855000376],
+        "Longitud": [-69.93012206251315],
         # Capacidad estimada para soportar el volumen anual de cajas del TXT (aprox 90M cajas/año)
         # Suponiendo 300 días operativos y promedio 5.6 L/caja -> ~1.7M Litros/día
-        "Capacidad_Produccion_LtsDia": 1_800_000, 
-        "Fecha_Inicio_Operaciones": date(2005, 1, 1), # Fecha histórica supuesta
-        "Estado_Operativo": "Activa",
-        "Certificaciones": "ISO 9001, FSSC 22000, ISO 14001"
-    }]
-
-    df = pl.DataFrame(planta_data)
+        "Capacidad_Produccion_LtsDia": [1_800_000],
+        "Fecha_Inicio_Operaciones": [date(2005, 1, 1)], # Fecha histórica supuesta
+        "Estado_Operativo": ["Activa"],
+        "Certificaciones": ["ISO 9001, FSSC 22000, ISO 14001"],
+    }, schema=SCHEMAS.get("DimPlanta"))
 
     # Asegurar tipos (Asumiendo SCHEMAS["DimPlanta"] definido por ti)
-    # df = df.cast(SCHEMAS["DimPlanta"])
     if "DimPlanta" in SCHEMAS:
         schema = SCHEMAS["DimPlanta"]
         df = asegurar_columnas(df, schema)
-        df = df.cast(dict(schema))  # type: ignore[arg-type]
+        df = asegurar_schema(df, schema)
         
     #logger.info("🔎 Sample de DimPlanta:\n" + df.head(1).to_pandas().to_string(index=False))
 
     guardar_parquet(df, "dim_planta")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_planta.parquet")
+    return df.lazy()
 
 # --------------------------------------------------------------------
 # 4. DimAlmacen (Almacén Central de Planta)
@@ -2015,34 +2119,51 @@ def generar_dim_planta():
 def generar_dim_almacen_planta(lf_planta: pl.LazyFrame) -> pl.LazyFrame:
     logger.info("    🏭 Generando DimAlmacen (Almacén Central de Planta)...")
     
-    # 1. Obtener datos de la planta (única)
-    df_planta = lf_planta.collect()
-    id_planta = df_planta["ID_Planta"][0]
-    nombre_planta = df_planta["Nombre_Planta"][0]
-    lat_planta = float(df_planta["Latitud"][0])
-    lon_planta = float(df_planta["Longitud"][0])
-
-    # 2. Datos del almacén central adjunto a la planta
-    almacen_data = [{
-        "ID_Almacen": "ALM-PLN-01",
-        "ID_Planta": id_planta,  # FK a DimPlanta, nombre alineado al mapa maestro
-        "Nombre_Almacen": f"Almacén Central - {nombre_planta}",
-        "Tipo_Almacen": "Centro de Distribución Principal (Anexo Planta)",
-        "Capacidad_M3": 150_000,      # capacidad en m³ (según mapa maestro)
-        "Capacidad_Pallets": 45_000,  # atributo extra útil para logística
-        "Tiene_Refrigeracion": True,
-        "Latitud": lat_planta,
-        "Longitud": lon_planta,
-        "Estado_Operativo": "Activo",
-    }]
+    # 1. Plantilla del almacén central adjunto a cada planta (atributos según mapa maestro)
+    plantilla_almacen = pl.LazyFrame(
+        {
+            "Tipo_Almacen": ["Centro de Distribución Principal (Anexo Planta)"],
+            "Capacidad_M3": [150_000],      # capacidad en m³
+            "Capacidad_Pallets": [45_000],  # atributo extra útil para logística
+            "Tiene_Refrigeracion": [True],
+            "Estado_Operativo": ["Activo"],
+        },
+        schema={
+            "Tipo_Almacen": pl.Utf8,
+            "Capacidad_M3": pl.Int32,
+            "Capacidad_Pallets": pl.Int32,
+            "Tiene_Refrigeracion": pl.Boolean,
+            "Estado_Operativo": pl.Utf8,
+        },
+    )
 
-    df = pl.DataFrame(almacen_data)
+    # 2. Planta x plantilla en un solo cross join (sin extraer escalares en Python)
+    df = (
+        lf_planta
+        .select(["ID_Planta", "Nombre_Planta", "Latitud", "Longitud"])
+        .join(plantilla_almacen, how="cross")
+        .select([
+            pl.format(
+                "ALM-PLN-{}", (pl.int_range(pl.len()) + 1).cast(pl.Utf8).str.zfill(2)
+            ).alias("ID_Almacen"),
+            "ID_Planta",  # FK a DimPlanta, nombre alineado al mapa maestro
+            pl.format("Almacén Central - {}", pl.col("Nombre_Planta")).alias("Nombre_Almacen"),
+            "Tipo_Almacen",
+            "Capacidad_M3",
+            "Capacidad_Pallets",
+            "Tiene_Refrigeracion",
+            "Latitud",
+            "Longitud",
+            "Estado_Operativo",
+        ])
+        .collect()
+    )
 
     # 3. Ajustar y verificar schema DimAlmacen
     if "DimAlmacen" in SCHEMAS:
         schema = SCHEMAS["DimAlmacen"]
         df = asegurar_columnas(df, schema)
-        df = df.cast(dict(schema))  # type: ignore[arg-type]
+        df = asegurar_schema(df, schema)
 
         """logger.info(f"Schema DimAlmacen esperado : {schema}")
         logger.info(f"Schema DimAlmacen obtenido: {df.schema}")
@@ -2054,7 +2175,7 @@ def generar_dim_almacen_planta(lf_planta: pl.LazyFrame) -> pl.LazyFrame:
     )"""
 
     guardar_parquet(df, "dim_almacen")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_almacen.parquet")
+    return df.lazy()
 
 
 # --------------------------------------------------------------------
@@ -2064,52 +2185,56 @@ def generar_dim_departamento() -> pl.LazyFrame:
     logger.info("    🏢 Generando DimDepartamento (basado en estructura RRHH)...")
     
     deptos_list = list(DEPARTAMENTOS_RRHH.keys())
+    n = len(deptos_list)
+    
+    objetivos = np.array([
+        "Eficiencia Operativa",
+        "Crecimiento Ventas",
+        "Reducción Costos",
+        "Satisfacción Cliente",
+        "Innovación",
+    ], dtype=object)
+    
+    # Atributos aleatorios en un solo sorteo NumPy por columna
+    rng = rng_dimension("DimDepartamento")
+    presupuesto = rng.integers(5_000_000, 80_000_001, size=n).astype(np.float32)
+    empleados = rng.integers(5, 201, size=n).astype(np.int32)
+    obj_idx = rng.integers(0, len(objetivos), size=n)
+    
+    nombres_legibles = [
+        depto_key.replace("_", " ").replace("IT_DataStrategy", "IT & Data Strategy")
+        for depto_key in deptos_list
+    ]
+    tipos_departamento = [
+        "Operativo" if any(x in depto_key for x in ["Logis", "Planta", "Seguridad", "Servicios"])
+        else "Comercial" if any(x in depto_key for x in ["Ventas", "Marketing"])
+        else "Administrativo"
+        for depto_key in deptos_list
+    ]
+    niveles_org = [
+        "Dirección" if "Direccion" in depto_key or "Gerencia" in depto_key
+        else "Operativo"
+        for depto_key in deptos_list
+    ]
     
-    data_deptos = []
-    for i, depto_key in enumerate(deptos_list):
-        nombre_legible = (
-            depto_key
-            .replace("_", " ")
-            .replace("IT_DataStrategy", "IT & Data Strategy")
-        )
-        
-        tipo_departamento = (
-            "Operativo" if any(x in depto_key for x in ["Logis", "Planta", "Seguridad", "Servicios"])
-            else "Comercial" if any(x in depto_key for x in ["Ventas", "Marketing"])
-            else "Administrativo"
-        )
-        
-        nivel_org = (
-            "Dirección" if "Direccion" in depto_key or "Gerencia" in depto_key
-            else "Operativo"
-        )
-        
-        data_deptos.append({
-            "Departamento_ID": f"DEP-{str(i+1).zfill(2)}",
-            "Nombre_Departamento": nombre_legible,
-            "Tipo_Departamento": tipo_departamento,
-            "Nivel_Organizacional": nivel_org,
-            "Presupuesto_Anual_Estimado_DOP": float(random.randint(5_000_000, 80_000_000)),
-            "Numero_Empleados_Estimado": random.randint(5, 200),
-            "Objetivo_Principal": random.choice([
-                "Eficiencia Operativa",
-                "Crecimiento Ventas",
-                "Reducción Costos",
-                "Satisfacción Cliente",
-                "Innovación",
-            ]),
-        })
-    
-    df = pl.DataFrame(data_deptos)
+    df = pl.DataFrame({
+        "Departamento_ID": [f"DEP-{i + 1:02d}" for i in range(n)],
+        "Nombre_Departamento": nombres_legibles,
+        "Tipo_Departamento": tipos_departamento,
+        "Nivel_Organizacional": niveles_org,
+        "Presupuesto_Anual_Estimado_DOP": presupuesto,
+        "Numero_Empleados_Estimado": empleados,
+        "Objetivo_Principal": objetivos[obj_idx],
+    })
 
     if "DimDepartamento" in SCHEMAS:
         schema = SCHEMAS["DimDepartamento"]
         df = asegurar_columnas(df, schema)
-        df = df.cast(dict(schema))  # type: ignore[arg-type]
+        df = asegurar_schema(df, schema)
         #assert df.schema == schema, "Schema de DimDepartamento no coincide con SCHEMAS['DimDepartamento']"
 
     guardar_parquet(df, "dim_departamento")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_departamento.parquet")
+    return df.lazy()
 
 
 # --------------------------------------------------------------------
@@ -2129,10 +2254,8 @@ def generar_dim_puesto(lf_departamento: pl.LazyFrame) -> pl.LazyFrame:
         )
     )
     
-    data_puestos = []
-    puesto_counter = 1
-    
-    # 3. Recorrer estructura maestra DEPARTAMENTOS_RRHH
+    # 3. Aplanar DEPARTAMENTOS_RRHH en filas (depto_key, id_depto, rol)
+    filas: list[tuple[str, str, dict]] = []
     for depto_key, roles in DEPARTAMENTOS_RRHH.items():
         # mismo nombre legible que usaste en generar_dim_departamento
         nombre_legible = (
@@ -2148,43 +2271,50 @@ def generar_dim_puesto(lf_departamento: pl.LazyFrame) -> pl.LazyFrame:
                 f"SALTANDO puestos de ese departamento."
             )
             continue
-            
-        for rol in roles:
-            nombre_puesto = rol["Puesto"]
-
-            # Nivel jerárquico simple por keywords
-            if any(x in nombre_puesto for x in ["Gerente", "Director", "Jefe", "Vicepresidente"]):
-                nivel = "Gerencial/Directivo"
-            elif any(x in nombre_puesto for x in ["Coordinador", "Supervisor", "Especialista",
-                                                  "Ingeniero", "Analista", "Abogado",
-                                                  "Contador", "KAM"]):
-                nivel = "Mando Medio/Especialista"
-            else:
-                nivel = "Operativo/Técnico"
-            
-            sueldo_min = float(rol.get("Sueldo_Min", 0))
-            sueldo_max = float(rol.get("Sueldo_Max", 0))
-            sueldo_prom = (sueldo_min + sueldo_max) / 2 if (sueldo_min or sueldo_max) else 0.0
-
-            data_puestos.append({
-                "Puesto_ID": f"PUE-{str(puesto_counter).zfill(3)}",
-                "Departamento_ID": id_depto,
-                "Nombre_Puesto": nombre_puesto,
-                "Nivel_Puesto": nivel,
-                "Salario_Base_Mensual_Min_DOP": sueldo_min,
-                "Salario_Base_Mensual_Max_DOP": sueldo_max,
-                "Salario_Base_Mensual_DOP": sueldo_prom,
-                "Es_Comercial": bool("Ventas" in depto_key or "Marketing" in depto_key),
-            })
-            puesto_counter += 1
-
-    df = pl.DataFrame(data_puestos)
+
+        filas.extend((depto_key, id_depto, rol) for rol in roles)
+
+    df = pl.DataFrame(
+        {
+            "Depto_Key": [f[0] for f in filas],
+            "Departamento_ID": [f[1] for f in filas],
+            "Nombre_Puesto": [f[2]["Puesto"] for f in filas],
+            "Salario_Base_Mensual_Min_DOP": [float(f[2].get("Sueldo_Min", 0)) for f in filas],
+            "Salario_Base_Mensual_Max_DOP": [float(f[2].get("Sueldo_Max", 0)) for f in filas],
+        },
+        schema={
+            "Depto_Key": pl.Utf8,
+            "Departamento_ID": pl.Utf8,
+            "Nombre_Puesto": pl.Utf8,
+            "Salario_Base_Mensual_Min_DOP": pl.Float32,
+            "Salario_Base_Mensual_Max_DOP": pl.Float32,
+        },
+    )
+
+    # Nivel jerárquico simple por keywords y bandera comercial (str.contains nativo)
+    df = df.with_columns([
+        pl.format(
+            "PUE-{}", (pl.int_range(pl.len()) + 1).cast(pl.Utf8).str.zfill(3)
+        ).alias("Puesto_ID"),
+        pl.when(pl.col("Nombre_Puesto").str.contains("Gerente|Director|Jefe|Vicepresidente"))
+        .then(pl.lit("Gerencial/Directivo"))
+        .when(pl.col("Nombre_Puesto").str.contains(
+            "Coordinador|Supervisor|Especialista|Ingeniero|Analista|Abogado|Contador|KAM"
+        ))
+        .then(pl.lit("Mando Medio/Especialista"))
+        .otherwise(pl.lit("Operativo/Técnico"))
+        .alias("Nivel_Puesto"),
+        (
+            (pl.col("Salario_Base_Mensual_Min_DOP") + pl.col("Salario_Base_Mensual_Max_DOP")) / 2
+        ).alias("Salario_Base_Mensual_DOP"),
+        pl.col("Depto_Key").str.contains("Ventas|Marketing").alias("Es_Comercial"),
+    ]).drop("Depto_Key")
 
     # 4. Ajustar y verificar schema DimPuesto (si está definido)
     if "DimPuesto" in SCHEMAS:
         schema = SCHEMAS["DimPuesto"]
         df = asegurar_columnas(df, schema)
-        df = df.cast(dict(schema))  # type: ignore[arg-type]
+        df = asegurar_schema(df, schema)
 
         """
         logger.info(f"Schema DimPuesto esperado : {schema}")
@@ -2197,7 +2327,7 @@ def generar_dim_puesto(lf_departamento: pl.LazyFrame) -> pl.LazyFrame:
     )"""
 
     guardar_parquet(df, "dim_puesto")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_puesto.parquet")
+    return ids_categoricos(df, ["Puesto_ID", "Departamento_ID"])
 
 # --------------------------------------------------------------------
 # 7. DimCEDIS (1 Principal + Regionales -- CENTRO DE DISTRIBUCION --)
@@ -2212,8 +2342,17 @@ def generar_dim_cedi(lf_geografia: pl.LazyFrame, lf_planta: pl.LazyFrame) -> pl.
     mapa_provincia = dict(
         zip(df_geo["Nombre_Provincia"], df_geo["ID_Provincia"])
     )
+    # Mapa ID_Provincia -> Region (evita un filter por cada CEDI)
+    mapa_region = dict(
+        zip(df_geo["ID_Provincia"].to_list(), df_geo["Region"].to_list())
+    )
+
+    # Columnas en orden del schema DimCEDIS; se agrega un valor por CEDI
+    cols: dict[str, list] = {col: [] for col in SCHEMAS["DimCEDIS"].names()}
 
-    cedis_data = []
+    def agregar_cedi(fila: dict) -> None:
+        for col, valor in fila.items():
+            cols[col].append(valor)
 
     # 1. CEDI principal asociado a la planta
     planta = df_planta.row(0, named=True)
@@ -2221,9 +2360,9 @@ def generar_dim_cedi(lf_geografia: pl.LazyFrame, lf_planta: pl.LazyFrame) -> pl.
     # Buscar provincia de la planta por nombre, si la tienes en DimPlanta
     nombre_prov_planta = "Distrito Nacional"  # o df_planta["Provincia"][0] si existe
     prov_planta = mapa_provincia.get(nombre_prov_planta, df_geo["ID_Provincia"][0])
-    region_planta = df_geo.filter(pl.col("ID_Provincia") == prov_planta)["Region"][0]
+    region_planta = mapa_region[prov_planta]
 
-    cedis_data.append({
+    agregar_cedi({
         "CEDI_ID": "CEDI-PRIN-01",
         "Nombre_CEDI": f"CEDI Principal - {planta['Nombre_Planta']}",
         "ID_Provincia": prov_planta,
@@ -2248,9 +2387,9 @@ def generar_dim_cedi(lf_geografia: pl.LazyFrame, lf_planta: pl.LazyFrame) -> pl.
             )
             prov_id = df_geo["ID_Provincia"][0]
 
-        region = df_geo.filter(pl.col("ID_Provincia") == prov_id)["Region"][0]
+        region = mapa_region[prov_id]
 
-        cedis_data.append({
+        agregar_cedi({
             "CEDI_ID": cedi_txt["ID_CEDI"],
             "Nombre_CEDI": cedi_txt["Nombre"],
             "ID_Provincia": prov_id,
@@ -2263,19 +2402,19 @@ def generar_dim_cedi(lf_geografia: pl.LazyFrame, lf_planta: pl.LazyFrame) -> pl.
             "Estado_Operativo": cedi_txt.get("Estado_Operativo", "Activo"),
         })
 
-    df = pl.DataFrame(cedis_data)
+    df = pl.from_dict(cols, schema=SCHEMAS.get("DimCEDIS"))
 
     if "DimCEDIS" in SCHEMAS:
         schema = SCHEMAS["DimCEDIS"]
         df = asegurar_columnas(df, schema)
-        df = df.cast(dict(schema))  # type: ignore[arg-type]
+        df = asegurar_schema(df, schema)
         
         """logger.info(f"Schema DimCEDIS esperado : {schema}")
         logger.info(f"Schema DimCEDIS obtenido: {df.schema}")
         assert df.schema == schema, "Schema de DimCEDIS no coincide con SCHEMAS['DimCEDIS']"
         """
     guardar_parquet(df, "dim_cedi")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_cedi.parquet")
+    return ids_categoricos(df, ["CEDI_ID"])
 
 
 # --------------------------------------------------------------------
@@ -2284,30 +2423,7 @@ def generar_dim_cedi(lf_geografia: pl.LazyFrame, lf_planta: pl.LazyFrame) -> pl.
 def generar_dim_producto_sku() -> pl.LazyFrame:
     logger.info("    🥤 Generando DimProducto (Catálogo SKU Consolidado)...")
     
-    # 1. Cargar bases
-    df_maestra = pl.DataFrame(PRODUCTOS_MAESTRA)
-    df_bepensa = pl.DataFrame(PRODUCTOS_BEPENSA_BASE)
-    
-    # 2. Normalizar nombres de columnas
-    df_maestra = df_maestra.rename({
-        "Codigo_Producto_SKU": "ID_ProductoSKU",
-        "Categoria": "Categoria_Maestra",
-    })
-    df_bepensa = df_bepensa.rename({
-        "ID_Prod_Unico": "ID_Ref_Bepensa",
-        "Nombre_Producto": "Nombre_Ref_Bepensa",
-    })
-    
-    # 3. Estandarizar texto para join
-    df_maestra = df_maestra.with_columns(
-        pl.col("Marca").str.to_uppercase()
-    )
-    df_bepensa = df_bepensa.with_columns([
-        pl.col("Marca").str.to_uppercase(),
-        pl.col("Categoria_Principal").str.to_uppercase(),
-    ])
-    
-    # 4. Mapeo manual de categorías MAESTRA -> BEPENSA_BASE
+    # 1. Mapeos de categorías (MAESTRA -> BEPENSA_BASE y MAESTRA -> global)
     cat_map = {
         "Refrescos": "CSD",
         "Refrescos_Lig": "CSD",
@@ -2323,28 +2439,6 @@ def generar_dim_producto_sku() -> pl.LazyFrame:
         "Agua Saborizada": "AGUA SABORIZADA",
     }
     
-    df_maestra = df_maestra.with_columns(
-        pl.col("Categoria_Maestra")
-        .replace(cat_map)
-        .fill_null("OTRO")
-        .alias("Categoria_Join")
-    )
-    
-    # 5. Left join para traer ISC
-    df_consolidado = df_maestra.join(
-        df_bepensa.select(["Marca", "Categoria_Principal", "Aplica_ISC", "Tasa_ISC_Pct"]),
-        left_on=["Marca", "Categoria_Join"],
-        right_on=["Marca", "Categoria_Principal"],
-        how="left",
-    )
-    
-    # Completar nulos de ISC
-    df_consolidado = df_consolidado.with_columns([
-        pl.col("Aplica_ISC").fill_null(False),
-        pl.col("Tasa_ISC_Pct").fill_null(0.0).cast(pl.Float32),
-    ])
-    
-    # 6. Mapeo a categorías globales (para estacionalidad)
     global_cat_map = {
         "Refrescos": "CSD (Gaseosas)",
         "Refrescos_Lig": "CSD (Gaseosas)",
@@ -2360,69 +2454,83 @@ def generar_dim_producto_sku() -> pl.LazyFrame:
         "Agua Saborizada": "Agua Saborizada",
     }
     
-    df_consolidado = df_consolidado.with_columns(
-        pl.col("Categoria_Maestra")
-        .replace(global_cat_map)
-        .fill_null("Otros")
-        .alias("Categoria_Global")
+    # Categoría -> código entero (Enum) y tablas de lookup alineadas por código.
+    # Las categorías sin mapeo conservan su nombre original (misma semántica que replace).
+    categorias = list(dict.fromkeys(
+        [*cat_map, *global_cat_map, *(p["Categoria"] for p in PRODUCTOS_MAESTRA if p.get("Categoria"))]
+    ))
+    lut_join = pl.Series("lut_join", [cat_map.get(c, c) for c in categorias], dtype=pl.Utf8)
+    lut_global = pl.Series("lut_global", [global_cat_map.get(c, c) for c in categorias], dtype=pl.Utf8)
+    
+    # 2. Base Bepensa (ISC) normalizada para el join
+    lf_bepensa = (
+        pl.DataFrame(PRODUCTOS_BEPENSA_BASE).lazy()
+        .with_columns([
+            pl.col("Marca").str.to_uppercase(),
+            pl.col("Categoria_Principal").str.to_uppercase(),
+        ])
+        .select(["Marca", "Categoria_Principal", "Aplica_ISC", "Tasa_ISC_Pct"])
     )
     
-    # 7. Estacionalidad por categoría global
-    def get_estacionalidad(cat_global: str) -> float:
-        return ESTACIONALIDAD_CATEGORIA.get(cat_global, 1.0)
-    
-    df_consolidado = df_consolidado.with_columns(
-        pl.col("Categoria_Global")
-        .map_elements(get_estacionalidad, return_dtype=pl.Float32)
-        .alias("Factor_Estacionalidad_Categoria")
-    )
-    
-    # 8. Selección y casteo final
-    df_final = df_consolidado.select([
-        "ID_ProductoSKU",
-        "Nombre_Producto",
-        "Marca",
-        "Sabor",
-        pl.col("Categoria_Maestra").alias("Categoria"),
-        "Categoria_Global",
-        "Volumen_Litros",
-        "Tipo_Envase",
-        "Unidades_Por_Caja",
-        "Precio_Lista_DOP",
-        "Costo_Prod_DOP",
-        "Peso_Venta",
-        "Aplica_ISC",
-        "Tasa_ISC_Pct",
-        "Factor_Estacionalidad_Categoria",
-        pl.lit(True).alias("Activo"),
-    ])
-    
-    df_final = df_final.with_columns([
-        pl.col("Volumen_Litros").cast(pl.Float32),
-        pl.col("Precio_Lista_DOP").cast(pl.Float32),
-        pl.col("Costo_Prod_DOP").cast(pl.Float32),
-        pl.col("Peso_Venta").cast(pl.Float32),
-    ])
-    
-    # 9. Normalizar pesos de venta
-    total_peso = df_final["Peso_Venta"].sum()
-    df_final = df_final.with_columns(
-        (pl.col("Peso_Venta") / total_peso).alias("Peso_Venta_Normalizado")
+    # 3. Pipeline único: renombrar, mapear, join ISC, estacionalidad, selección y pesos
+    lf_final = (
+        pl.DataFrame(PRODUCTOS_MAESTRA).lazy()
+        .rename({
+            "Codigo_Producto_SKU": "ID_ProductoSKU",
+            "Categoria": "Categoria_Maestra",
+        })
+        .with_columns([
+            pl.col("Marca").str.to_uppercase(),
+            pl.col("Categoria_Maestra").cast(pl.Enum(categorias)).to_physical().alias("_cat_code"),
+        ])
+        .with_columns(
+            pl.lit(lut_join).gather(pl.col("_cat_code")).fill_null("OTRO").alias("Categoria_Join"),
+            pl.lit(lut_global).gather(pl.col("_cat_code")).fill_null("Otros").alias("Categoria_Global"),
+        )
+        .join(
+            lf_bepensa,
+            left_on=["Marca", "Categoria_Join"],
+            right_on=["Marca", "Categoria_Principal"],
+            how="left",
+        )
+        .select([
+            "ID_ProductoSKU",
+            "Nombre_Producto",
+            "Marca",
+            "Sabor",
+            pl.col("Categoria_Maestra").alias("Categoria"),
+            "Categoria_Global",
+            pl.col("Volumen_Litros").cast(pl.Float32),
+            "Tipo_Envase",
+            "Unidades_Por_Caja",
+            pl.col("Precio_Lista_DOP").cast(pl.Float32),
+            pl.col("Costo_Prod_DOP").cast(pl.Float32),
+            pl.col("Peso_Venta").cast(pl.Float32),
+            pl.col("Aplica_ISC").fill_null(False),
+            pl.col("Tasa_ISC_Pct").fill_null(0.0).cast(pl.Float32),
+            pl.col("Categoria_Global")
+            .replace_strict(ESTACIONALIDAD_CATEGORIA, default=1.0, return_dtype=pl.Float32)
+            .alias("Factor_Estacionalidad_Categoria"),
+            pl.lit(True).alias("Activo"),
+        ])
+        .with_columns(
+            (pl.col("Peso_Venta") / pl.col("Peso_Venta").sum()).alias("Peso_Venta_Normalizado")
+        )
     )
     
-        # 10. Ajustar y verificar schema DimProducto
+    # 4. Ajustar schema DimProducto sobre el plan lazy (el cast se fusiona con el sink)
     if "DimProducto" in SCHEMAS:
         schema = SCHEMAS["DimProducto"]
-        df_final = asegurar_columnas(df_final, schema)
-        df_final = df_final.cast(dict(schema))  # type: ignore[arg-type]
+        lf_final = asegurar_columnas(lf_final, schema)
+        lf_final = asegurar_schema(lf_final, schema)
         """
         logger.info(f"Schema DimProducto esperado : {schema}")
-        logger.info(f"Schema DimProducto obtenido: {df_final.schema}")
-        assert df_final.schema == schema, "Schema de DimProducto no coincide con SCHEMAS['DimProducto']"
+        logger.info(f"Schema DimProducto obtenido: {lf_final.collect_schema()}")
+        assert lf_final.collect_schema() == schema, "Schema de DimProducto no coincide con SCHEMAS['DimProducto']"
         """
     
-    guardar_parquet(df_final, "dim_producto")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_producto.parquet")
+    # Sin materializar: sink_parquet y lectura perezosa del archivo resultante
+    return pl.scan_parquet(guardar_parquet(lf_final, "dim_producto"))
 
 # --------------------------------------------------------------------
 # 9. DimCanalDistribucion (basado en CANALES_RD)
@@ -2430,64 +2538,68 @@ def generar_dim_producto_sku() -> pl.LazyFrame:
 def generar_dim_canal_distribucion() -> pl.LazyFrame:
     logger.info("    🏪 Generando DimCanalDistribucion (basado en CANALES_RD)...")
     
-    canales_data = []
-    for i, (nombre_canal, info) in enumerate(CANALES_RD.items()):
-        canales_data.append({
-            "ID_Canal": f"CAN-{str(i+1).zfill(2)}",
-            "Nombre_Canal": nombre_canal,
-            "Peso_Mercado": info["peso"],
-            "Segmentos_Objetivo": ",".join(info["segmentos"]),
-            "Es_Ticket_Bajo": info["ticket_bajo"],
-            "Estado": "Activo",
-        })
-    
-    df = pl.DataFrame(canales_data)
+    # Columnas construidas directamente (sin lista de dicts)
+    nombres = list(CANALES_RD.keys())
+    pesos = [float(info["peso"]) for info in CANALES_RD.values()]
+    total_peso = sum(pesos)
     
-    # Normalizar pesos
-    total_peso = df["Peso_Mercado"].sum()
-    df = df.with_columns(
-        (pl.col("Peso_Mercado") / total_peso).alias("Peso_Mercado_Normalizado")
+    df = pl.from_dict(
+        {
+            "ID_Canal": [f"CAN-{i + 1:02d}" for i in range(len(nombres))],
+            "Nombre_Canal": nombres,
+            "Peso_Mercado": pesos,
+            "Peso_Mercado_Normalizado": [p / total_peso for p in pesos],
+            "Segmentos_Objetivo": [",".join(info["segmentos"]) for info in CANALES_RD.values()],
+            "Es_Ticket_Bajo": [bool(info["ticket_bajo"]) for info in CANALES_RD.values()],
+            "Estado": ["Activo"] * len(nombres),
+        },
+        schema=SCHEMAS.get("DimCanalDistribucion"),
     )
     
-    # Cast de tipos numéricos
-    df = df.with_columns([
-        pl.col("Peso_Mercado").cast(pl.Float32),
-        pl.col("Peso_Mercado_Normalizado").cast(pl.Float32),
-    ])
-    
     # Verificación de schema
     if "DimCanalDistribucion" in SCHEMAS:
         schema = SCHEMAS["DimCanalDistribucion"]
         df = asegurar_columnas(df, schema)
-        df = df.cast(dict(schema))  # type: ignore[arg-type]
+        df = asegurar_schema(df, schema)
 
     
     guardar_parquet(df, "dim_canal_distribucion")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_canal_distribucion.parquet")
+    return df.lazy()
 
 # --------------------------------------------------------------------
 # 10. DimCluster (Segmentación Estratégica)
 # --------------------------------------------------------------------
 def generar_dim_cluster() -> pl.LazyFrame:
     logger.info("    🧩 Generando DimCluster (Segmentación Estratégica)...")
-    data = [
-        {"Cluster_ID": 1, "Nombre_Cluster": "VIP - Estratégico", "Descripcion": "Alto volumen, alta frecuencia, alta rentabilidad", "Nivel_Prioridad": 1},
-        {"Cluster_ID": 2, "Nombre_Cluster": "Desarrollo", "Descripcion": "Volumen medio, potencial de crecimiento", "Nivel_Prioridad": 2},
-        {"Cluster_ID": 3, "Nombre_Cluster": "Estándar", "Descripcion": "Compra recurrente promedio, mantenimiento", "Nivel_Prioridad": 3},
-        {"Cluster_ID": 4, "Nombre_Cluster": "Ocasional / Riesgo", "Descripcion": "Baja frecuencia, bajo volumen o riesgo de churn", "Nivel_Prioridad": 4},
-    ]
-    df = pl.DataFrame(data).with_columns([
-        pl.col("Cluster_ID").cast(pl.Int8),
-        pl.col("Nivel_Prioridad").cast(pl.Int8),
-    ])
+    df = pl.from_dict(
+        {
+            "Cluster_ID": [1, 2, 3, 4],
+            "Nombre_Cluster": ["VIP - Estratégico", "Desarrollo", "Estándar", "Ocasional / Riesgo"],
+            "Descripcion": [
+                "Alto volumen, alta frecuencia, alta rentabilidad",
+                "Volumen medio, potencial de crecimiento",
+                "Compra recurrente promedio, mantenimiento",
+                "Baja frecuencia, bajo volumen o riesgo de churn",
+            ],
+            "Nivel_Prioridad": [1, 2, 3, 4],
+        },
+        schema=SCHEMAS.get("DimCluster"),
+    )
 
     if "DimCluster" in SCHEMAS:
         schema = SCHEMAS["DimCluster"]
         df = asegurar_columnas(df, schema)
-        df = df.cast(dict(schema))  # type: ignore[arg-type]
+        df = asegurar_schema(df, schema)
       
     guardar_parquet(df, "dim_cluster")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_cluster.parquet")
+    return df.lazy()
+
+
+# Distribuciones de cluster según segmento: A/B -> [1, 2], resto -> [3, 4]
+_CLUSTERS_AB = np.array([1, 2], dtype=np.int8)
+_CLUSTER_AB_PROBS = np.array([0.6, 0.4])
+_CLUSTERS_CD = np.array([3, 4], dtype=np.int8)
+_CLUSTER_CD_PROBS = np.array([0.7, 0.3])
 
 
 # --------------------------------------------------------------------
@@ -2537,12 +2649,65 @@ def generar_dim_cliente_masiva(
     else:
         pesos_canal_global = np.ones_like(pesos_canal_global, dtype=float) / len(pesos_canal_global)
 
-    rng = np.random.default_rng(SEED_VAL)
-    current_customer_id_counter = 0
-    faker_es = Faker("es_ES")
+    # Canal -> (segmentos, probabilidades normalizadas), calculado una sola vez
+    SEG_LOOKUP = {
+        nombre: (
+            np.array(list(pesos.keys()), dtype=object),
+            np.array(list(pesos.values()), dtype=np.float64) / sum(pesos.values()),
+        )
+        for nombre, pesos in PESO_SEGMENTACION_CANAL.items()
+    }
 
-    # Acumulador: lista de dicts con todos los clientes
-    clientes_activos_historicos: list[dict] = []
+    # Tabla CDF (n_canales, n_segmentos) alineada con ids_canal; segmentos codificados como enteros.
+    # Canales sin distribución quedan marcados y reciben "E" / cluster 4.
+    seg_labels = np.array(
+        list(dict.fromkeys(["E", *(s for segs, _ in SEG_LOOKUP.values() for s in segs)])),
+        dtype=object,
+    )
+    seg_code = {s: k for k, s in enumerate(seg_labels)}
+    cdf_table = np.ones((len(ids_canal), len(seg_labels)), dtype=np.float64)
+    canal_con_seg = np.zeros(len(ids_canal), dtype=bool)
+    for idx_canal, nombre in enumerate(nombres_canal):
+        lookup = SEG_LOOKUP.get(nombre)
+        if lookup is None:
+            continue
+        probs = np.zeros(len(seg_labels), dtype=np.float64)
+        for s, p in zip(*lookup):
+            probs[seg_code[s]] += p
+        cdf_table[idx_canal] = np.cumsum(probs)
+        canal_con_seg[idx_canal] = True
+    es_ab_code = np.isin(seg_labels, ["A", "B"])
+    cluster_ab_cdf = np.cumsum(_CLUSTER_AB_PROBS)
+    cluster_cd_cdf = np.cumsum(_CLUSTER_CD_PROBS)
+
+    rng = rng_dimension("DimCliente")
+    current_customer_id_counter = 0
+    faker_es = _FAKER_ES
+
+    # Pools de textos precargados (Faker solo aquí, una vez); los nombres se ensamblan por índice
+    pool_nombres = pool_textos_faker(faker_es.first_name, 2_000)
+    pool_apellidos = pool_textos_faker(faker_es.last_name, 2_000)
+    pool_empresas = pool_textos_faker(faker_es.company, 10_000)
+
+    # Buffers columnares preasignados (cota superior: suma de targets anuales)
+    total_max_clientes = int(sum(NUM_CLIENTES_POR_ANO.values()))
+    buffers: dict[str, np.ndarray] = {
+        "ID_Cliente": np.zeros(total_max_clientes, dtype=np.uint32),
+        "Nombre_Cliente": np.empty(total_max_clientes, dtype=object),
+        "ID_Provincia": np.empty(total_max_clientes, dtype=object),
+        "ID_Canal": np.empty(total_max_clientes, dtype=object),
+        "Segmento_Cliente": np.empty(total_max_clientes, dtype=object),
+        "Cluster_ID": np.zeros(total_max_clientes, dtype=np.int8),
+        "Fecha_Alta": np.empty(total_max_clientes, dtype="datetime64[D]"),
+        "Activo": np.zeros(total_max_clientes, dtype=bool),
+        "Latitud": np.empty(total_max_clientes, dtype=np.float32),
+        "Longitud": np.empty(total_max_clientes, dtype=np.float32),
+        "Ano_Creacion": np.zeros(total_max_clientes, dtype=np.int16),
+    }
+    activo_np = buffers["Activo"]
+    ano_creacion_np = buffers["Ano_Creacion"]
+    cursor = 0
+    num_activos = 0  # contador incremental de clientes activos
 
     # -------------------------
     # 3. Loop por años
@@ -2553,98 +2718,99 @@ def generar_dim_cliente_masiva(
         target_clientes_este_ano = NUM_CLIENTES_POR_ANO[ano]
 
         # 3.1 Churn sobre clientes ya existentes (a partir del 2do año)
-        if i > 0 and clientes_activos_historicos:
-            df_temp_clientes = pl.DataFrame(clientes_activos_historicos, schema=SCHEMAS["DimCliente"])
-
-            candidatos_mask = (df_temp_clientes["Ano_Creacion"] < ano) & (df_temp_clientes["Activo"])
-            num_candidatos: int = int(candidatos_mask.sum())
+        if i > 0 and cursor > 0:
+            candidatos_mask = (ano_creacion_np[:cursor] < ano) & activo_np[:cursor]
+            idx_candidatos = np.flatnonzero(candidatos_mask)
 
-            if num_candidatos > 0:
-                churn_decisions = rng.random(size=num_candidatos) < CHURN_RATE_ANUAL
-
-                activo_np = df_temp_clientes["Activo"].to_numpy().copy()
-                idx_candidatos = np.where(candidatos_mask.to_numpy())[0]
+            if idx_candidatos.size > 0:
+                churn_decisions = rng.random(size=idx_candidatos.size) < CHURN_RATE_ANUAL
                 activo_np[idx_candidatos[churn_decisions]] = False
-
-                df_temp_clientes = df_temp_clientes.with_columns(
-                    pl.Series("Activo", activo_np)
-                )
-
-                num_inactivos_antes = int(sum(not c["Activo"] for c in clientes_activos_historicos))
-                num_inactivos_despues = int((~df_temp_clientes["Activo"]).sum())
-                num_churned = max(0, num_inactivos_despues - num_inactivos_antes)
+                num_churned = int(churn_decisions.sum())
+                num_activos -= num_churned
 
                 logger.info(
                     f" 📉 Aplicado Churn del {CHURN_RATE_ANUAL:.0%} en {ano}. "
                     f"Clientes inactivos nuevos este año por churn: {num_churned}."
                 )
-
-                clientes_activos_historicos = df_temp_clientes.to_dicts()
             else:
                 logger.info(f" 📉 Sin candidatos a churn en {ano}.")
 
         # 3.2 Número de clientes activos actuales
-        current_active_customers = sum(1 for c in clientes_activos_historicos if c["Activo"])
+        current_active_customers = num_activos
 
         # 3.3 Clientes nuevos necesarios para llegar al target
         num_nuevos: int = max(0, target_clientes_este_ano - current_active_customers)
 
         if num_nuevos > 0:
-            new_client_data: list[dict] = []
-
-            for _ in range(num_nuevos):
-                current_customer_id_counter += 1
-
-                # Geografía y canal
-                asign_geo_id = rng.choice(ids_geo, p=pesos_geo)
-                asign_canal_idx = rng.choice(len(ids_canal), p=pesos_canal_global)
-                asign_canal_id = ids_canal[asign_canal_idx]
-                asign_canal_nombre = nombres_canal[asign_canal_idx]
-
-                # Segmento y cluster
-                segmento_elegido = "E"
-                cluster_elegido = 4
-
-                pesos_seg_canal = PESO_SEGMENTACION_CANAL.get(asign_canal_nombre)
-                if pesos_seg_canal:
-                    segmentos_validos = list(pesos_seg_canal.keys())
-                    probs_seg = np.array(list(pesos_seg_canal.values()), dtype=float)
-                    probs_seg = probs_seg / probs_seg.sum()
-                    segmento_elegido = str(rng.choice(segmentos_validos, p=probs_seg))
-
-                    if segmento_elegido in ["A", "B"]:
-                        cluster_elegido = int(rng.choice([1, 2], p=[0.6, 0.4]))
-                    else:
-                        cluster_elegido = int(rng.choice([3, 4], p=[0.7, 0.3]))
-
-                # Fecha de alta y ubicación
-                fecha_alta = date(ano, random.randint(1, 12), random.randint(1, 28))
-
-                new_client_data.append(
-                    {
-                        "ID_Cliente": f"CLI-{current_customer_id_counter:06d}",
-                        "Nombre_Cliente": faker_es.company()
-                        if random.random() < 0.7
-                        else faker_es.name(),
-                        "ID_Provincia": asign_geo_id,
-                        "ID_Canal": asign_canal_id,
-                        "Segmento_Cliente": segmento_elegido,
-                        "Cluster_ID": cluster_elegido,
-                        "Fecha_Alta": fecha_alta,
-                        "Activo": True,
-                        "Latitud": float(rng.uniform(18.0, 19.8)),
-                        "Longitud": float(rng.uniform(-71.5, -68.5)),
-                        "Ano_Creacion": int(ano),
-                    }
-                )
+            # Sorteos vectorizados del año (una llamada NumPy por columna)
+            asign_geo = rng.choice(ids_geo, size=num_nuevos, p=pesos_geo)
+            asign_canal_idx = rng.choice(len(ids_canal), size=num_nuevos, p=pesos_canal_global)
+
+            # Segmento y cluster en una sola pasada: uniformes + búsqueda en la CDF del canal
+            u_seg = rng.random(num_nuevos)
+            u_cluster = rng.random(num_nuevos)
+            cod_seg = (u_seg[:, None] >= cdf_table[asign_canal_idx]).sum(axis=1)
+            cod_seg = np.minimum(cod_seg, len(seg_labels) - 1)
+            con_seg = canal_con_seg[asign_canal_idx]
+            cod_seg[~con_seg] = seg_code["E"]
+
+            clusters_nuevos = np.where(
+                es_ab_code[cod_seg],
+                _CLUSTERS_AB[np.minimum(np.searchsorted(cluster_ab_cdf, u_cluster, side="right"), 1)],
+                _CLUSTERS_CD[np.minimum(np.searchsorted(cluster_cd_cdf, u_cluster, side="right"), 1)],
+            ).astype(np.int8)
+            clusters_nuevos[~con_seg] = 4
+            segmentos_nuevos = seg_labels[cod_seg]
+
+            # Fecha de alta (mes 1-12, día 1-28) construida en datetime64
+            meses = rng.integers(1, 13, size=num_nuevos)
+            dias = rng.integers(1, 29, size=num_nuevos)
+            fechas_alta = (
+                (np.datetime64(f"{ano}-01", "M") + (meses - 1)).astype("datetime64[D]") + (dias - 1)
+            )
+
+            ids_nuevos = np.arange(
+                current_customer_id_counter + 1, current_customer_id_counter + num_nuevos + 1,
+                dtype=np.uint32,
+            )
+            current_customer_id_counter += num_nuevos
+
+            # Nombres: 70% empresas, 30% personas (nombre + dos apellidos), muestreados de los pools
+            mask_empresa = rng.random(num_nuevos) < 0.7
+            n_empresas = int(mask_empresa.sum())
+            n_personas = num_nuevos - n_empresas
+            nombres_nuevos = np.empty(num_nuevos, dtype=object)
+            nombres_nuevos[mask_empresa] = pool_empresas[rng.integers(0, len(pool_empresas), n_empresas)]
+            nombres_nuevos[~mask_empresa] = (
+                pool_nombres[rng.integers(0, len(pool_nombres), n_personas)] + " "
+                + pool_apellidos[rng.integers(0, len(pool_apellidos), n_personas)] + " "
+                + pool_apellidos[rng.integers(0, len(pool_apellidos), n_personas)]
+            )
 
-            clientes_activos_historicos.extend(new_client_data)
+            # Volcado del lote anual en el tramo [cursor, cursor + num_nuevos)
+            tramo = slice(cursor, cursor + num_nuevos)
+            buffers["ID_Cliente"][tramo] = ids_nuevos
+            buffers["Nombre_Cliente"][tramo] = nombres_nuevos
+            buffers["ID_Provincia"][tramo] = asign_geo
+            buffers["ID_Canal"][tramo] = ids_canal[asign_canal_idx]
+            buffers["Segmento_Cliente"][tramo] = segmentos_nuevos
+            buffers["Cluster_ID"][tramo] = clusters_nuevos
+            buffers["Fecha_Alta"][tramo] = fechas_alta
+            buffers["Activo"][tramo] = True
+            buffers["Latitud"][tramo] = rng.uniform(18.0, 19.8, size=num_nuevos).astype(np.float32)
+            buffers["Longitud"][tramo] = rng.uniform(-71.5, -68.5, size=num_nuevos).astype(np.float32)
+            buffers["Ano_Creacion"][tramo] = ano
+            cursor += num_nuevos
+            num_activos += num_nuevos
 
     # -------------------------
-    # 4. Consolidación final
+    # 4. Consolidación final (una sola construcción desde los buffers)
     # -------------------------
-    if clientes_activos_historicos:
-        df_final = pl.DataFrame(clientes_activos_historicos, schema=SCHEMAS["DimCliente"])
+    if cursor > 0:
+        df_final = pl.from_dict(
+            {col: arr[:cursor] for col, arr in buffers.items()},
+            schema=SCHEMAS.get("DimCliente"),
+        )
     else:
         logger.warning("⚠️ No se generaron clientes. Retornando DataFrame vacío.")
         df_final = pl.DataFrame(schema=SCHEMAS.get("DimCliente"))
@@ -2653,13 +2819,14 @@ def generar_dim_cliente_masiva(
     if "DimCliente" in SCHEMAS:
         schema: pl.Schema = SCHEMAS["DimCliente"]
         df_final = asegurar_columnas(df_final, schema)
-        df_final = df_final.cast(dict(schema))  # type: ignore[arg-type]
+        df_final = asegurar_schema(df_final, schema)
         """logger.info(f"Schema DimCliente esperado : {schema}")
         logger.info(f"Schema DimCliente obtenido: {df_final.schema}")
         assert df_final.schema == schema, "Schema de DimCliente no coincide con SCHEMAS['DimCliente']"""
 
     guardar_parquet(df_final, "dim_cliente")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_cliente.parquet")
+    # Llaves compartidas con los hechos como Categorical: joins por índice u32 bajo el string cache global
+    return ids_categoricos(df_final, ["ID_Provincia", "ID_Canal", "Segmento_Cliente"])
 
 # --------------------------------------------------------------------
 # 12. DimEmpleado (Fuerza Laboral Completa)
@@ -2677,22 +2844,18 @@ def generar_dim_empleado(
     df_cedi         = lf_cedi.collect()
     df_geografia    = lf_geografia.collect()
 
-    empleados_data = []
-    empleado_id_counter = 1
-    
-    rng  = np.random.default_rng(SEED_VAL)
-    fake = Faker("es_ES")
+    rng  = rng_dimension("DimEmpleado")
+    fake = _FAKER_ES
 
     mapa_puesto_info = (
         df_puesto
-        .group_by("Puesto_ID")
+        .group_by("Puesto_ID", maintain_order=True)
         .agg(
             pl.col("Nombre_Puesto").first(),
             pl.col("Departamento_ID").first(),
             pl.col("Salario_Base_Mensual_Min_DOP").first(),
             pl.col("Salario_Base_Mensual_Max_DOP").first(),
         )
-        .to_dicts()
     )
     
     provincia_ids   = df_geografia["ID_Provincia"].to_list()
@@ -2728,106 +2891,129 @@ def generar_dim_empleado(
         "Oficial de Seguridad_CCTV": 95,
     }
 
-    for puesto_info_dict in mapa_puesto_info:
-        id_puesto       = puesto_info_dict["Puesto_ID"]
-        nombre_puesto   = puesto_info_dict["Nombre_Puesto"]
-        id_departamento = puesto_info_dict["Departamento_ID"]
-        sueldo_min      = float(puesto_info_dict["Salario_Base_Mensual_Min_DOP"])
-        sueldo_max      = float(puesto_info_dict["Salario_Base_Mensual_Max_DOP"])
-        
-        num_empleados_para_puesto = CANTIDAD_EMPLEADOS_POR_PUESTO.get(
-            nombre_puesto,
-            random.randint(1, 3),
+    # 1) Cantidad de empleados por puesto (atributos del puesto se repiten por empleado)
+    #    Puestos sin volumen definido: 1-3 sorteado en lote; gerencias/direcciones topadas en 2
+    df_cantidades = mapa_puesto_info.with_columns(
+        pl.Series("_cantidad_default", rng.integers(1, 4, size=mapa_puesto_info.height))
+    ).with_columns(
+        pl.col("Nombre_Puesto")
+        .replace_strict(
+            CANTIDAD_EMPLEADOS_POR_PUESTO,
+            default=pl.col("_cantidad_default"),
+            return_dtype=pl.Int64,
         )
+        .alias("Cantidad")
+    ).with_columns(
+        pl.when(pl.col("Nombre_Puesto").str.contains("Gerente|Director"))
+        .then(pl.min_horizontal(pl.col("Cantidad"), pl.lit(2, dtype=pl.Int64)))
+        .otherwise(pl.col("Cantidad"))
+        .alias("Cantidad")
+    )
 
-        if "Gerente" in nombre_puesto or "Director" in nombre_puesto:
-            num_empleados_para_puesto = min(num_empleados_para_puesto, 2)
+    ids_puesto = df_cantidades["Puesto_ID"].to_list()
+    ids_depto = df_cantidades["Departamento_ID"].to_list()
+    sueldos_min = df_cantidades["Salario_Base_Mensual_Min_DOP"].to_numpy().astype(np.float64)
+    sueldos_max = df_cantidades["Salario_Base_Mensual_Max_DOP"].to_numpy().astype(np.float64)
+    cantidades = df_cantidades["Cantidad"].to_numpy()
 
-        for _ in range(num_empleados_para_puesto):
-            salario = round(rng.uniform(sueldo_min, sueldo_max), 2)
-            fecha_contratacion = fake.date_between(
-                start_date=date(2010, 1, 1),
-                end_date="today",
-            )
+    cantidades_np = np.array(cantidades, dtype=np.int64)
+    TOTAL_N = int(cantidades_np.sum())
 
-            empleados_data.append({
-                "Empleado_ID": f"EMP-{str(empleado_id_counter).zfill(5)}",
-                "Nombre_Completo": fake.name(),
-                "Departamento_ID": id_departamento,
-                "Puesto_ID": id_puesto,
-                "CEDI_ID": None,  # se asigna luego
-                "Provincia_ID_Residencia": rng.choice(
-                    provincia_ids, p=pesos_provincia
-                ),
-                "Fecha_Contratacion": fecha_contratacion,
-                "Salario_Base_Mensual_DOP": salario,
-                "Estatus_Empleado": "Activo",
-                "Email_Corporativo": fake.email(),
-                "Telefono_Contacto": fake.phone_number(),
-                "Fecha_Nacimiento": fake.date_of_birth(
-                    minimum_age=20,
-                    maximum_age=60,
-                ),
-                "Genero": random.choice(
-                    ["Masculino", "Femenino", "Otro"]
-                ),
-                "Experiencia_Anios": (
-                    date.today() - fecha_contratacion
-                ).days // 365,
-                "Tipo_Contrato": random.choice(
-                    ["Indefinido", "Temporal"]
-                ),
-            })
-            empleado_id_counter += 1
-
-    df_empleado = pl.DataFrame(empleados_data)
+    # Atributos numéricos/fechas en lote (una llamada NumPy por columna)
+    salarios = np.round(
+        rng.uniform(
+            np.repeat(np.array(sueldos_min), cantidades_np),
+            np.repeat(np.array(sueldos_max), cantidades_np),
+        ),
+        2,
+    )
+    hoy = np.datetime64(date.today(), "D")
+    inicio_contratacion = np.datetime64(date(2010, 1, 1), "D")
+    dias_rango = int((hoy - inicio_contratacion).astype(np.int64))
+    fechas_contratacion = inicio_contratacion + rng.integers(0, dias_rango + 1, size=TOTAL_N)
+    # Nacimiento entre 20 y 60 años atrás (mismo rango que fake.date_of_birth)
+    fechas_nacimiento = hoy - rng.integers(
+        int(20 * 365.25), int(61 * 365.25), size=TOTAL_N
+    )
+    experiencia = ((hoy - fechas_contratacion).astype(np.int64) // 365).astype(np.int8)
+
+    # Campos de texto Faker en comprensiones (sin dicts por fila)
+    nombres   = [fake.name() for _ in range(TOTAL_N)]
+    emails    = [fake.email() for _ in range(TOTAL_N)]
+    telefonos = [fake.phone_number() for _ in range(TOTAL_N)]
+    p_provincia = np.array(pesos_provincia, dtype=np.float64)
+    residencias = rng.choice(
+        np.array(provincia_ids, dtype=object), size=TOTAL_N, p=p_provincia / p_provincia.sum()
+    )
+
+    df_empleado = pl.DataFrame({
+        "Empleado_ID": ids_secuenciales("EMP-", TOTAL_N, 5),
+        "Nombre_Completo": nombres,
+        "Departamento_ID": np.repeat(np.array(ids_depto, dtype=object), cantidades_np),
+        "Puesto_ID": np.repeat(np.array(ids_puesto, dtype=object), cantidades_np),
+        "Provincia_ID_Residencia": residencias,
+        "Fecha_Contratacion": fechas_contratacion,
+        "Salario_Base_Mensual_DOP": salarios,
+        "Estatus_Empleado": ["Activo"] * TOTAL_N,
+        "Email_Corporativo": emails,
+        "Telefono_Contacto": telefonos,
+        "Fecha_Nacimiento": fechas_nacimiento,
+        "Genero": rng.choice(np.array(["Masculino", "Femenino", "Otro"], dtype=object), size=TOTAL_N),
+        "Experiencia_Anios": experiencia,
+        "Tipo_Contrato": rng.choice(np.array(["Indefinido", "Temporal"], dtype=object), size=TOTAL_N),
+    })
 
     # 2) Provincia -> Región -> CEDI, con fallback CEDI-PRIN-01
-    region_por_prov = dict(zip(df_geografia["ID_Provincia"], df_geografia["Region"]))
-    cedis_por_region: dict[str, list[str]] = {}
-    for row in df_cedi.iter_rows(named=True):
-        reg = row["Region_Operacion"]
-        cedis_por_region.setdefault(reg, []).append(row["CEDI_ID"])
+    df_region_prov = df_geografia.select([
+        pl.col("ID_Provincia").alias("Provincia_ID_Residencia"),
+        "Region",
+    ])
+    df_cedis_region = (
+        df_cedi
+        .group_by("Region_Operacion")
+        .agg(pl.col("CEDI_ID").alias("CEDIS_Region"))
+        .rename({"Region_Operacion": "Region"})
+    )
 
     # ID del CEDI principal
     cedi_principal = "CEDI-PRIN-01"
 
-    def provincia_a_cedi(prov_id: str | None) -> str:
-        if prov_id is None:
-            return cedi_principal
-        reg = region_por_prov.get(prov_id)
-        if reg is None:
-            return cedi_principal
-        cedis_reg = cedis_por_region.get(reg)
-        if not cedis_reg:
-            return cedi_principal
-        return random.choice(cedis_reg)
-
-    # 3) Asignar CEDI_ID a todos según provincia (con fallback)
-    df_empleado = df_empleado.with_columns(
-        pl.col("Provincia_ID_Residencia").map_elements(
-            provincia_a_cedi,
-            return_dtype=pl.Utf8,
-        ).alias("CEDI_ID")
-    )
-
-    # 4) Casts finales
-    df_empleado = df_empleado.with_columns(
-        [
-            pl.col("CEDI_ID").cast(pl.Utf8),
-            pl.col("Salario_Base_Mensual_DOP").cast(pl.Float32),
-            pl.col("Experiencia_Anios").cast(pl.Int8),
-        ]
+    # 3) Asignar CEDI_ID a todos según provincia (joins nativos + índice aleatorio dentro de la región)
+    df_empleado = (
+        df_empleado
+        .with_row_index("_orden")
+        .with_columns(pl.Series("_rand", rng.integers(0, 2**31 - 1, size=df_empleado.height)))
+        .join(df_region_prov, on="Provincia_ID_Residencia", how="left")
+        .join(df_cedis_region, on="Region", how="left")
+        .with_columns(
+            pl.col("CEDIS_Region")
+            .list.get(pl.col("_rand") % pl.col("CEDIS_Region").list.len())
+            .cast(pl.Utf8)
+            .fill_null(cedi_principal)
+            .alias("CEDI_ID")
+        )
+        .sort("_orden")
+        .drop(["_orden", "_rand", "Region", "CEDIS_Region"])
     )
 
-    # 5) Verificación schema DimEmpleado
+    # 4) Tipos finales: el schema maestro castea en una sola pasada; casts manuales solo sin él
     if "DimEmpleado" in SCHEMAS:
         schema = SCHEMAS["DimEmpleado"]
         df_empleado = asegurar_columnas(df_empleado, schema)
-        df_empleado = df_empleado.cast(dict(schema))  # type: ignore[arg-type]
+        df_empleado = asegurar_schema(df_empleado, schema)
+    else:
+        df_empleado = df_empleado.with_columns(
+            [
+                pl.col("CEDI_ID").cast(pl.Utf8),
+                pl.col("Salario_Base_Mensual_DOP").cast(pl.Float32),
+                pl.col("Experiencia_Anios").cast(pl.Int8),
+            ]
+        )
 
     guardar_parquet(df_empleado, "dim_empleado")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_empleado.parquet")
+    return ids_categoricos(
+        df_empleado, ["Empleado_ID", "Puesto_ID", "Departamento_ID", "CEDI_ID", "Provincia_ID_Residencia"]
+    )
 
 
 # --------------------------------------------------------------------
@@ -2836,54 +3022,48 @@ def generar_dim_empleado(
 def generar_dim_promocion() -> pl.LazyFrame:
     logger.info("    🎟️ Generando DimPromocion (Catálogo de Ofertas)...")
     
-    promos_data: list[dict] = []
-
-    # Fila base: Sin promoción
-    promos_data.append({
-        "ID_Promocion": "PROM-000",
-        "Nombre_Promocion": "Sin Promoción",
-        "Descripcion": "Venta regular sin descuento ni incentivo promocional",
-        "Factor_Incremento_Venta": 1.0,      # venta base
-        "Peso_Probabilidad_Uso": 0.0,        # se controla por lógica de negocio
-        "Activa": True
-    })
+    # Columnas numéricas desde PROMOCIONES_MAESTRAL (escala: incremento absoluto y % de peso)
+    n_promos = len(PROMOCIONES_MAESTRAL)
+    nombres = [promo["Promocion"] for promo in PROMOCIONES_MAESTRAL]
+    pesos_incremento_venta = np.fromiter(
+        (float(promo["Peso_Incremento_Venta"]) for promo in PROMOCIONES_MAESTRAL),
+        dtype=np.float64,
+        count=n_promos,
+    )
+    pesos_incremento_pct = np.fromiter(
+        (float(promo["%_Peso_Incremento"]) for promo in PROMOCIONES_MAESTRAL),
+        dtype=np.float64,
+        count=n_promos,
+    )
 
-    # Resto de promociones desde PROMOCIONES_MAESTRAL
-    for i, promo in enumerate(PROMOCIONES_MAESTRAL, start=1):
-        # Asegurar que los campos numéricos vienen en escala correcta
-        peso_incremento_venta = float(promo["Peso_Incremento_Venta"])
-        peso_incremento_pct  = float(promo["%_Peso_Incremento"])
-
-        factor_incremento = 1.0 + peso_incremento_venta
-        peso_prob_uso     = peso_incremento_pct / 100.0
-
-        promos_data.append({
-            "ID_Promocion": f"PROM-{str(i).zfill(3)}",
-            "Nombre_Promocion": promo["Promocion"],
-            "Descripcion": (
-                f"Promoción '{promo['Promocion']}' con impacto estimado de "
-                f"{peso_incremento_pct:.1f}% sobre la venta base"
-            ),
-            "Factor_Incremento_Venta": factor_incremento,
-            "Peso_Probabilidad_Uso": peso_prob_uso,
-            "Activa": True
-        })
-        
-    df = pl.DataFrame(promos_data).with_columns(
-        [
-            pl.col("Factor_Incremento_Venta").cast(pl.Float32),
-            pl.col("Peso_Probabilidad_Uso").cast(pl.Float32),
-            pl.col("Activa").cast(pl.Boolean),
-        ]
+    # Fila base (PROM-000: sin promoción) antepuesta al catálogo
+    df = pl.from_dict(
+        {
+            "ID_Promocion": ids_secuenciales("PROM-", n_promos + 1, 3, inicio=0),
+            "Nombre_Promocion": ["Sin Promoción"] + nombres,
+            "Descripcion": ["Venta regular sin descuento ni incentivo promocional"] + [
+                f"Promoción '{nombre}' con impacto estimado de {pct:.1f}% sobre la venta base"
+                for nombre, pct in zip(nombres, pesos_incremento_pct)
+            ],
+            # Venta base 1.0; resto 1.0 + Peso_Incremento_Venta
+            "Factor_Incremento_Venta": np.concatenate(
+                [[1.0], 1.0 + pesos_incremento_venta]
+            ).astype(np.float32),
+            # Sin promoción: 0.0 (se controla por lógica de negocio)
+            "Peso_Probabilidad_Uso": np.concatenate(
+                [[0.0], pesos_incremento_pct / 100.0]
+            ).astype(np.float32),
+            "Activa": np.ones(n_promos + 1, dtype=bool),
+        },
+        schema=SCHEMAS.get("DimPromocion"),
     )
 
-    # Ajustar al esquema maestro si existe
     if "DimPromocion" in SCHEMAS:
         df = asegurar_columnas(df, SCHEMAS["DimPromocion"])
-        df = df.cast(SCHEMAS["DimPromocion"])
+        df = asegurar_schema(df, SCHEMAS["DimPromocion"])
 
     guardar_parquet(df, "dim_promocion")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_promocion.parquet")
+    return df.lazy()
 
 
 # --------------------------------------------------------------------
@@ -2920,7 +3100,7 @@ def generar_dim_vendedor(
         if "DimVendedor" in SCHEMAS:
             df_empty = pl.DataFrame(schema=SCHEMAS["DimVendedor"])
             guardar_parquet(df_empty, "dim_vendedor")
-            return pl.scan_parquet(DIRS["OUTPUT"] / "dim_vendedor.parquet")
+            return df_empty.lazy()
         return pl.DataFrame().lazy()
 
     # 4) Perfiles de venta (incluye los 5 puestos de Ventas)
@@ -2963,106 +3143,137 @@ def generar_dim_vendedor(
         ),
     }
 
-    # 5) Tabla auxiliar Puesto_ID -> Nombre_Puesto
-    df_puesto_nombres = df_puesto.select(["Puesto_ID", "Nombre_Puesto"])
+    # Matching de perfil precalculado: dict exacto + claves en minúsculas recorridas en orden de PERFILES_VENTA
+    # (gana la primera clave del dict contenida en el puesto, no la que aparece antes en el texto)
+    perfil_exacto = {k: k for k in PERFILES_VENTA}
+    perfil_minusculas = [(k.lower(), k) for k in PERFILES_VENTA]
+
+    def resolver_perfil(nombre_puesto: str) -> str:
+        perfil = perfil_exacto.get(nombre_puesto)
+        if perfil is not None:
+            return perfil
+        nombre_lower = nombre_puesto.lower()
+        for clave_lower, clave in perfil_minusculas:
+            if clave_lower in nombre_lower:
+                return clave
+        # Fallback genérico
+        return "Vendedor_Preventista" if "Vendedor" in nombre_puesto else "Promotor/Merchandiser"
 
-    def es_gerente_o_supervisor(pid: str) -> bool:
-        fila = df_puesto_nombres.filter(pl.col("Puesto_ID") == pid)
-        if fila.is_empty():
-            return False
-        nombre = fila["Nombre_Puesto"][0]
-        return ("Gerente" in nombre) or ("Supervisor" in nombre)
+    # 5) Mapa auxiliar Puesto_ID -> Nombre_Puesto (construido una sola vez)
+    df_puesto_nombres = df_puesto.select(["Puesto_ID", "Nombre_Puesto"])
+    puesto_id_to_nombre = dict(
+        zip(df_puesto_nombres["Puesto_ID"].to_list(), df_puesto_nombres["Nombre_Puesto"].to_list())
+    )
+    gerente_sup_ids = {
+        pid for pid, nom in puesto_id_to_nombre.items()
+        if "Gerente" in nom or "Supervisor" in nom
+    }
+    # Perfil resuelto una vez por puesto (no por vendedor)
+    perfil_por_puesto = {pid: resolver_perfil(nom) for pid, nom in puesto_id_to_nombre.items()}
 
     # 6) Gerentes/supervisores por CEDI (para Gerente_Directo_ID)
     gerentes_disponibles = df_vendedores_base.filter(
-        pl.col("Puesto_ID").map_elements(es_gerente_o_supervisor, return_dtype=pl.Boolean)
+        pl.col("Puesto_ID").is_in(list(gerente_sup_ids))
     ).select(["Empleado_ID", "CEDI_ID"])
 
-    mapa_gerentes_por_cedi: dict[str, list[str]] = {}
-    for row in gerentes_disponibles.iter_rows(named=True):
-        cedi = row["CEDI_ID"]
-        if cedi is None:
-            continue
-        mapa_gerentes_por_cedi.setdefault(cedi, []).append(row["Empleado_ID"])
-
-    # 7) Construir DimVendedor
-    vendedores_data: list[dict] = []
-
-    for row in df_vendedores_base.iter_rows(named=True):
-        id_empleado        = row["Empleado_ID"]
-        puesto_id          = row["Puesto_ID"]
-        nombre_completo    = row["Nombre_Completo"]
-        cedi_base_id       = row["CEDI_ID"]
-        fecha_contratacion = row["Fecha_Contratacion"]
-
-        nombre_puesto_empleado = df_puesto.filter(
-            pl.col("Puesto_ID") == puesto_id
-        )["Nombre_Puesto"][0]
-
-        # 7.1 Determinar perfil (prioriza match exacto para los puestos de Ventas)
-        perfil_encontrado = None
-
-        # Match exacto
-        for perfil_key in PERFILES_VENTA.keys():
-            if perfil_key == nombre_puesto_empleado:
-                perfil_encontrado = perfil_key
-                break
-
-        # Match por contiene si no hubo exacto
-        if perfil_encontrado is None:
-            for perfil_key in PERFILES_VENTA.keys():
-                if perfil_key.lower() in nombre_puesto_empleado.lower():
-                    perfil_encontrado = perfil_key
-                    break
+    gerentes_por_cedi = (
+        gerentes_disponibles
+        .drop_nulls("CEDI_ID")
+        .group_by("CEDI_ID", maintain_order=True)
+        .agg(pl.col("Empleado_ID").alias("ids"))
+    )
+    mapa_gerentes_por_cedi: dict[str, list[str]] = dict(
+        zip(gerentes_por_cedi["CEDI_ID"].to_list(), gerentes_por_cedi["ids"].to_list())
+    )
 
-        # Fallback genérico
-        if perfil_encontrado is None:
-            if "Vendedor" in nombre_puesto_empleado:
-                perfil_encontrado = "Vendedor_Preventista"
-            else:
-                perfil_encontrado = "Promotor/Merchandiser"
+    # 7) Construir DimVendedor (vectorizado: join de perfiles + sorteos NumPy en lote)
+    rng = rng_dimension("DimVendedor")
+    n_vend = df_vendedores_base.height
 
-        enfoque, meta_base, comision, es_gerencial, prom_clientes = PERFILES_VENTA[perfil_encontrado]
+    df_perfiles = pl.DataFrame(
+        {
+            "Tipo_Vendedor": list(PERFILES_VENTA.keys()),
+            "Enfoque_Canal": [v[0] for v in PERFILES_VENTA.values()],
+            "Meta_Base": [float(v[1]) for v in PERFILES_VENTA.values()],
+            "Porcentaje_Comision_Objetivo": [float(v[2]) for v in PERFILES_VENTA.values()],
+            "Es_Supervisor_Gerente": [bool(v[3]) for v in PERFILES_VENTA.values()],
+            "Prom_Clientes": [int(v[4]) for v in PERFILES_VENTA.values()],
+        },
+        schema={
+            "Tipo_Vendedor": pl.Utf8,
+            "Enfoque_Canal": pl.Utf8,
+            "Meta_Base": pl.Float64,
+            "Porcentaje_Comision_Objetivo": pl.Float32,
+            "Es_Supervisor_Gerente": pl.Boolean,
+            "Prom_Clientes": pl.Int16,
+        },
+    )
 
-        # Meta ajustada +/- 10 %
-        meta_real = meta_base * random.uniform(0.9, 1.1)
-
-        # Gerente directo por CEDI (solo si no es rol gerencial)
-        gerente_directo_id = None
-        if (not es_gerencial) and (cedi_base_id in mapa_gerentes_por_cedi):
-            gerente_directo_id = random.choice(mapa_gerentes_por_cedi[cedi_base_id])
-
-        vendedores_data.append({
-            "Vendedor_ID": id_empleado,
-            "Empleado_ID": id_empleado,
-            "Puesto_ID": puesto_id,
-            "Nombre_Vendedor": nombre_completo,
-            "CEDI_Base_ID": cedi_base_id,
-            "Tipo_Vendedor": perfil_encontrado,
-            "Enfoque_Canal": enfoque,
-            "Meta_Venta_Mensual_DOP": round(meta_real, 2),
-            "Porcentaje_Comision_Objetivo": comision,
-            "Telefono_Flota": f"809-{random.randint(200, 999)}-{random.randint(1000, 9999)}",
-            "Nivel_Experiencia": random.choice(["Junior", "Intermedio", "Senior", "Master"]),
-            "Fecha_Asignacion_Ruta": fecha_contratacion,
-            "Estado_Vendedor": "Activo",
-            "Gerente_Directo_ID": gerente_directo_id,
-            "Promedio_Clientes_Visitados_Dia": prom_clientes if not es_gerencial else 0,
-            "Es_Supervisor_Gerente": es_gerencial,
-        })
+    df_vend = (
+        df_vendedores_base
+        .select(["Empleado_ID", "Puesto_ID", "Nombre_Completo", "CEDI_ID", "Fecha_Contratacion"])
+        .with_row_index("_orden")
+        .with_columns(
+            pl.col("Puesto_ID").cast(pl.Utf8)
+            .replace_strict(perfil_por_puesto, return_dtype=pl.Utf8)
+            .alias("Tipo_Vendedor")
+        )
+        .join(df_perfiles, on="Tipo_Vendedor", how="left")
+        .sort("_orden")
+    )
 
-    df_dim_vendedor = pl.DataFrame(vendedores_data).with_columns([
-        pl.col("Meta_Venta_Mensual_DOP").cast(pl.Float32),
-        pl.col("Porcentaje_Comision_Objetivo").cast(pl.Float32),
-        pl.col("Promedio_Clientes_Visitados_Dia").cast(pl.Int16),
-        pl.col("Gerente_Directo_ID").cast(pl.Utf8),
+    # Gerente directo por CEDI (solo si no es rol gerencial): índice aleatorio dentro de la lista del CEDI
+    cedis_vend = df_vend["CEDI_ID"].to_numpy()
+    es_gerencial_vend = df_vend["Es_Supervisor_Gerente"].to_numpy()
+    u_gerente = rng.random(n_vend)
+    gerente_directo = np.full(n_vend, None, dtype=object)
+    for cedi, ids_gerentes in mapa_gerentes_por_cedi.items():
+        pos = np.flatnonzero((cedis_vend == cedi) & ~es_gerencial_vend)
+        if pos.size:
+            ids_arr = np.array(ids_gerentes, dtype=object)
+            gerente_directo[pos] = ids_arr[(u_gerente[pos] * len(ids_arr)).astype(np.int64)]
+
+    df_dim_vendedor = df_vend.select([
+        pl.col("Empleado_ID").alias("Vendedor_ID"),
+        "Empleado_ID",
+        "Puesto_ID",
+        pl.col("Nombre_Completo").alias("Nombre_Vendedor"),
+        pl.col("CEDI_ID").alias("CEDI_Base_ID"),
+        "Tipo_Vendedor",
+        "Enfoque_Canal",
+        # Meta ajustada +/- 10 %
+        (pl.col("Meta_Base") * pl.Series(rng.uniform(0.9, 1.1, size=n_vend))).round(2).alias("Meta_Venta_Mensual_DOP"),
+        "Porcentaje_Comision_Objetivo",
+        pl.format(
+            "809-{}-{}",
+            pl.Series(rng.integers(200, 1000, size=n_vend)),
+            pl.Series(rng.integers(1000, 10000, size=n_vend)),
+        ).alias("Telefono_Flota"),
+        pl.Series(
+            "Nivel_Experiencia",
+            rng.choice(np.array(["Junior", "Intermedio", "Senior", "Master"], dtype=object), size=n_vend),
+            dtype=pl.Utf8,
+        ),
+        pl.col("Fecha_Contratacion").alias("Fecha_Asignacion_Ruta"),
+        pl.lit("Activo").alias("Estado_Vendedor"),
+        pl.Series("Gerente_Directo_ID", gerente_directo, dtype=pl.Utf8),
+        pl.when(pl.col("Es_Supervisor_Gerente")).then(0).otherwise(pl.col("Prom_Clientes"))
+        .alias("Promedio_Clientes_Visitados_Dia"),
+        "Es_Supervisor_Gerente",
     ])
 
-    # 8) Ajustar al schema maestro
+    # 8) Ajustar al schema maestro (un único cast); casts manuales solo sin él
     if "DimVendedor" in SCHEMAS:
         schema = SCHEMAS["DimVendedor"]
         df_dim_vendedor = asegurar_columnas(df_dim_vendedor, schema)
-        df_dim_vendedor = df_dim_vendedor.cast(dict(schema))  # type: ignore[arg-type]
+        df_dim_vendedor = asegurar_schema(df_dim_vendedor, schema)
+    else:
+        df_dim_vendedor = df_dim_vendedor.with_columns([
+            pl.col("Meta_Venta_Mensual_DOP").cast(pl.Float32),
+            pl.col("Porcentaje_Comision_Objetivo").cast(pl.Float32),
+            pl.col("Promedio_Clientes_Visitados_Dia").cast(pl.Int16),
+            pl.col("Gerente_Directo_ID").cast(pl.Utf8),
+        ])
        # logger.info(f"Schema DimVendedor esperado : {schema}")
         #logger.info(f"Schema DimVendedor obtenido: {df_dim_vendedor.schema}")
        # assert df_dim_vendedor.schema == schema, "Schema de DimVendedor no coincide con SCHEMAS['DimVendedor']"
@@ -3074,7 +3285,7 @@ def generar_dim_vendedor(
     )"""
 
     guardar_parquet(df_dim_vendedor, "dim_vendedor")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_vendedor.parquet")
+    return df_dim_vendedor.lazy()
 
 
 # --------------------------------------------------------------------
@@ -3151,98 +3362,98 @@ def generar_dim_vehiculo(lf_cedis: pl.LazyFrame) -> pl.LazyFrame:
         },
     ]
     
-    vehiculos_data: list[dict] = []
-    
-    consecutivo = 1
-    rng = np.random.default_rng(SEED_VAL)
-
-    for row_cedi in df_cedis.iter_rows(named=True):
-        cedi_id = row_cedi["CEDI_ID"]
-        
-        # Principal vs regional
-        tipo_cedi = str(row_cedi["Tipo_CEDI"] or "").upper()
-        es_principal = ("PRINCIPAL" in tipo_cedi) or ("PRIN" in cedi_id)
-        
-        # Volumen de flota por CEDI
-        n_vehiculos_base = random.randint(30, 45) if es_principal else random.randint(15, 20)
-        
-        for _ in range(n_vehiculos_base):
-            # Mix de tipos por CEDI
-            if es_principal:
-                weights = [0.25, 0.20, 0.20, 0.10, 0.20, 0.05]
-            else:
-                weights = [0.15, 0.30, 0.30, 0.15, 0.05, 0.05]
-            
-            tipo = rng.choice(TIPOS_VEHICULOS, p=weights)
-
-            # Placa: una letra + 6 dígitos
-            placa_letras = rng.choice(list("ABCDL"))
-            placa_nums = rng.integers(100000, 999999)
-
-            anho_fab = int(rng.integers(2015, 2023))
-            kilometraje_base = (date.today().year - anho_fab) * 20000
-            kilometraje_actual = int(
-                rng.integers(
-                    max(1000, kilometraje_base - 10000),
-                    kilometraje_base + 30000,
-                )
-            )
-            
-            vehiculos_data.append(
-                {
-                    "ID_Vehiculo": f"VEH-{str(consecutivo).zfill(4)}",
-                    "CEDI_Asignado_ID": cedi_id,
-                    "Placa": f"{placa_letras}{placa_nums}",
-                    "Marca_Modelo": tipo["Modelo"],
-                    "Tipo_Vehiculo": tipo["Tipo"],
-                    "Capacidad_Carga_Ton": tipo["Cap_Ton"],
-                    "Capacidad_Volumen_M3": tipo["Vol_M3"],
-                    "Rendimiento_Promedio_KmL": tipo["Km_L"],
-                    "Costo_Fijo_Operativo_Diario_DOP": tipo["Costo_Dia"],
-                    "Uso_Principal": tipo["Uso"],
-                    "Anio_Fabricacion": anho_fab,
-                    "Kilometraje_Actual_KM": kilometraje_actual,
-                    "Estado_Vehiculo": rng.choice(
-                        ["Operativo", "En Taller", "Baja"], p=[0.85, 0.12, 0.03]
-                    ),
-                    "Tiene_GPS": rng.choice([True, True, False]),
-                    "Valor_Adquisicion_DOP": round(
-                        float(rng.uniform(tipo["Costo_Dia"] * 100, tipo["Costo_Dia"] * 300)), 2
-                    ),
-                    "Depreciacion_Anual_Pct": tipo["Depreciacion_Anual_Pct"],
-                }
-            )
-            consecutivo += 1
-
-    df_vehiculo = pl.DataFrame(vehiculos_data)
-
-    df_vehiculo = df_vehiculo.with_columns(
-        [
-            pl.col("Capacidad_Carga_Ton").cast(pl.Float32),
-            pl.col("Capacidad_Volumen_M3").cast(pl.Float32),
-            pl.col("Rendimiento_Promedio_KmL").cast(pl.Float32),
-            pl.col("Costo_Fijo_Operativo_Diario_DOP").cast(pl.Float32),
-            pl.col("Valor_Adquisicion_DOP").cast(pl.Float32),
-            pl.col("Depreciacion_Anual_Pct").cast(pl.Float32),
-            pl.col("Kilometraje_Actual_KM").cast(pl.Int64),
-        ]
+    rng = rng_dimension("DimVehiculo")
+
+    # 1) Volumen de flota por CEDI (principal vs regional)
+    tipos_cedi = df_cedis["Tipo_CEDI"].to_list()
+    es_principal_cedi = np.array([
+        ("PRINCIPAL" in str(tipo or "").upper()) or ("PRIN" in cedi_id)
+        for cedi_id, tipo in zip(cedi_ids, tipos_cedi)
+    ], dtype=bool)
+    n_veh_cedi = np.where(
+        es_principal_cedi,
+        rng.integers(30, 46, size=len(cedi_ids)),
+        rng.integers(15, 21, size=len(cedi_ids)),
     )
+    TOTAL_V = int(n_veh_cedi.sum())
+
+    cedi_por_vehiculo = np.repeat(np.array(cedi_ids, dtype=object), n_veh_cedi)
+    es_principal_veh = np.repeat(es_principal_cedi, n_veh_cedi)
+
+    # 2) Tipo de vehículo: un solo sorteo uniforme + búsqueda en la CDF del mix del CEDI
+    cdf_principal = np.cumsum([0.25, 0.20, 0.20, 0.10, 0.20, 0.05])
+    cdf_regional  = np.cumsum([0.15, 0.30, 0.30, 0.15, 0.05, 0.05])
+    u_tipo = rng.random(TOTAL_V)
+    tipo_idx = np.where(
+        es_principal_veh,
+        np.searchsorted(cdf_principal, u_tipo, side="right"),
+        np.searchsorted(cdf_regional, u_tipo, side="right"),
+    )
+    tipo_idx = np.minimum(tipo_idx, len(TIPOS_VEHICULOS) - 1)
+
+    def atributo_tipo(clave: str, dtype=object) -> np.ndarray:
+        return np.array([t[clave] for t in TIPOS_VEHICULOS], dtype=dtype)[tipo_idx]
+
+    costo_dia = atributo_tipo("Costo_Dia", np.float32)
+
+    # 3) Placa (una letra + 6 dígitos), año y kilometraje en lote
+    placa_letras = np.array(list("ABCDL"))[rng.integers(0, 5, size=TOTAL_V)]
+    placa_nums = rng.integers(100000, 999999, size=TOTAL_V)
+    anho_fab = rng.integers(2015, 2023, size=TOTAL_V, dtype=np.int16)
+    kilometraje_base = (date.today().year - anho_fab.astype(np.int32)) * 20000
+    kilometraje_actual = rng.integers(
+        np.maximum(1000, kilometraje_base - 10000),
+        kilometraje_base + 30000,
+        dtype=np.int32,
+    )
+
+    df_vehiculo = pl.DataFrame({
+        "ID_Vehiculo": ids_secuenciales("VEH-", TOTAL_V, 4),
+        "CEDI_Asignado_ID": cedi_por_vehiculo,
+        "Placa": pl.Series(placa_letras) + pl.Series(placa_nums).cast(pl.Utf8),
+        "Marca_Modelo": atributo_tipo("Modelo"),
+        "Tipo_Vehiculo": atributo_tipo("Tipo"),
+        "Capacidad_Carga_Ton": atributo_tipo("Cap_Ton", np.float32),
+        "Capacidad_Volumen_M3": atributo_tipo("Vol_M3", np.float32),
+        "Rendimiento_Promedio_KmL": atributo_tipo("Km_L", np.float32),
+        "Costo_Fijo_Operativo_Diario_DOP": costo_dia,
+        "Uso_Principal": atributo_tipo("Uso"),
+        "Anio_Fabricacion": anho_fab,
+        "Kilometraje_Actual_KM": kilometraje_actual,
+        "Estado_Vehiculo": rng.choice(
+            np.array(["Operativo", "En Taller", "Baja"], dtype=object), size=TOTAL_V, p=[0.85, 0.12, 0.03]
+        ),
+        "Tiene_GPS": rng.choice(np.array([True, True, False]), size=TOTAL_V),
+        "Valor_Adquisicion_DOP": np.round(rng.uniform(costo_dia * 100, costo_dia * 300), 2).astype(np.float32),
+        "Depreciacion_Anual_Pct": atributo_tipo("Depreciacion_Anual_Pct", np.float32),
+    })
 
+    # Los arrays ya nacen con los dtypes del schema (float32 / int16 / int32)
     if "DimVehiculo" in SCHEMAS:
         df_vehiculo = asegurar_columnas(df_vehiculo, SCHEMAS["DimVehiculo"])
-        df_vehiculo = df_vehiculo.cast(SCHEMAS["DimVehiculo"])
+        df_vehiculo = asegurar_schema(df_vehiculo, SCHEMAS["DimVehiculo"])
 
     guardar_parquet(df_vehiculo, "dim_vehiculo")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_vehiculo.parquet")
+    return df_vehiculo.lazy()
 
 # --------------------------------------------------------------------
 # 16. DimRuta (Conexión Logística CEDI-Geografía-Recursos)
 # --------------------------------------------------------------------
-import random
-from geopy.distance import geodesic
 from faker import Faker
 
-fake = Faker("es_ES")
+fake = _FAKER_ES
+
+RADIO_TIERRA_KM = 6371.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Distancia haversine (km) vectorizada en NumPy; acepta escalares o arrays (broadcast)."""
+    lat1r, lon1r = np.radians(lat1), np.radians(lon1)
+    lat2r, lon2r = np.radians(lat2), np.radians(lon2)
+    dlat = lat2r - lat1r
+    dlon = lon2r - lon1r
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1r) * np.cos(lat2r) * np.sin(dlon / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * np.arcsin(np.sqrt(a))
 
 def generar_dim_ruta(
     lf_cedi: pl.LazyFrame,
@@ -3257,7 +3468,8 @@ def generar_dim_ruta(
     df_vehiculo = lf_vehiculo.collect()
     df_vendedor = lf_vendedor.collect()
     
-    rutas_data: list[dict] = []
+    # Bloques columnares por CEDI (arrays NumPy tipados), concatenados al final
+    bloques_ruta: dict[str, list[np.ndarray]] = {}
     
     VELOCIDAD_PROMEDIO_KMH = {
         "Urbana Densa": 20.0,
@@ -3266,10 +3478,42 @@ def generar_dim_ruta(
         "Autopista": 70.0,
     }
     
-    rng = np.random.default_rng(SEED_VAL)
-    random.seed(SEED_VAL)
+    TRAMOS_DISTANCIA_RUTA_KM = np.array([25.0, 50.0, 150.0])
+    TIPOS_RUTA_GEO = np.array(
+        ["Urbana Densa", "Urbana Estándar", "Interurbana Regular", "Autopista"], dtype=object
+    )
+    VELOCIDADES_TIPO_RUTA = np.array(
+        [VELOCIDAD_PROMEDIO_KMH.get(t, 40.0) for t in TIPOS_RUTA_GEO], dtype=np.float64
+    )
+
+    rng = rng_dimension("DimRuta")
+
+    COLS_GEO = ["ID_Provincia", "Nombre_Provincia", "Latitud", "Longitud"]
+    COLS_VEH = ["ID_Vehiculo", "Marca_Modelo"]
+    COLS_VEND = ["Vendedor_ID", "Nombre_Vendedor", "Tipo_Vendedor"]
 
-    consecutivo_ruta = 1
+    def columnas_np(df: pl.DataFrame, cols: list[str]) -> dict[str, np.ndarray]:
+        return {c: df[c].to_numpy() for c in cols}
+
+    # Particiones precalculadas una sola vez (claves de partition_by(as_dict=True) son tuplas)
+    geos_por_region = {
+        k[0]: columnas_np(sub, COLS_GEO)
+        for k, sub in df_geo.partition_by("Region", as_dict=True).items()
+    }
+    vehiculos_por_cedi = {
+        k[0]: columnas_np(sub, COLS_VEH)
+        for k, sub in df_vehiculo
+        .filter(pl.col("Estado_Vehiculo") == "Operativo")
+        .partition_by("CEDI_Asignado_ID", as_dict=True)
+        .items()
+    }
+    vendedores_por_cedi = {
+        k[0]: columnas_np(sub, COLS_VEND)
+        for k, sub in df_vendedor
+        .filter(pl.col("Estado_Vendedor") == "Activo")
+        .partition_by("CEDI_Base_ID", as_dict=True)
+        .items()
+    }
 
     for row_cedi in df_cedi.iter_rows(named=True):
         cedi_id   = row_cedi["CEDI_ID"]
@@ -3280,50 +3524,40 @@ def generar_dim_ruta(
         capacidad = row_cedi["Capacidad_Pallets"]
 
         # Geografías objetivo por región
-        geos_objetivo = (
-            df_geo
-            .filter(pl.col("Region") == region_op)
-            .to_dicts()
-        )
+        geos_objetivo = geos_por_region.get(region_op)
 
-        if not geos_objetivo:
+        if geos_objetivo is None:
             logger.warning(
                 f"⚠️ No hay geografías para la región '{region_op}' del CEDI {cedi_id}. "
                 "Usando geografías aleatorias."
             )
-            geos_objetivo = df_geo.sample(
-                n=min(3, df_geo.height),
-                seed=int(rng.integers(0, 10_000)),
-            ).to_dicts()
+            geos_objetivo = columnas_np(
+                df_geo.sample(n=min(3, df_geo.height), seed=int(rng.integers(0, 10_000))),
+                COLS_GEO,
+            )
 
         # Vehículos operativos del CEDI
-        vehiculos_disponibles = (
-            df_vehiculo
-            .filter(
-                (pl.col("CEDI_Asignado_ID") == cedi_id)
-                & (pl.col("Estado_Vehiculo") == "Operativo")
-            )
-            .to_dicts()
-        )
+        vehiculos_disponibles = vehiculos_por_cedi.get(cedi_id)
 
         # Vendedores activos base en el CEDI
-        vendedores_disponibles = (
-            df_vendedor
-            .filter(
-                (pl.col("CEDI_Base_ID") == cedi_id)
-                & (pl.col("Estado_Vendedor") == "Activo")
-            )
-            .to_dicts()
-        )
+        vendedores_disponibles = vendedores_por_cedi.get(cedi_id)
 
-        if not vehiculos_disponibles or not vendedores_disponibles:
+        if vehiculos_disponibles is None or vendedores_disponibles is None:
             logger.warning(
                 f"⚠️ CEDI {cedi_id} ({cedi_nom}) sin suficientes vehículos o vendedores operativos. "
                 "Se omiten rutas para este CEDI."
             )
             continue
 
-        cant_veh = len(vehiculos_disponibles)
+        # Distancia lineal CEDI -> cada destino candidato, en una sola llamada vectorizada
+        distancias_geo = haversine_km(
+            cedi_lat,
+            cedi_lon,
+            geos_objetivo["Latitud"].astype(np.float64),
+            geos_objetivo["Longitud"].astype(np.float64),
+        )
+
+        cant_veh = len(vehiculos_disponibles["ID_Vehiculo"])
 
         # Regla "entera": máximo 2 rutas por vehículo
         max_rutas_por_vehiculo = 2
@@ -3340,108 +3574,92 @@ def generar_dim_ruta(
         )
         num_rutas_por_cedi = max(num_rutas_por_cedi, 10)
 
-        for _ in range(num_rutas_por_cedi):
-            vehiculo = random.choice(vehiculos_disponibles)
-            vendedor = random.choice(vendedores_disponibles)
-            geo_dest = random.choice(geos_objetivo)
-
-            lat_dest = geo_dest["Latitud"]
-            lon_dest = geo_dest["Longitud"]
+        # Sorteos en lote para todas las rutas del CEDI (índices + atributos categóricos)
+        N = num_rutas_por_cedi
+        idx_v = rng.integers(0, cant_veh, size=N)
+        idx_s = rng.integers(0, len(vendedores_disponibles["Vendedor_ID"]), size=N)
+        idx_g = rng.integers(0, len(geos_objetivo["ID_Provincia"]), size=N)
 
-            # Distancia geodésica (km)
-            distancia_lineal = geodesic(
-                (cedi_lat, cedi_lon),
-                (lat_dest, lon_dest),
-            ).km
+        distancias_ruta = np.maximum(5.0, distancias_geo[idx_g] * rng.uniform(1.3, 1.6, size=N))
 
-            distancia_ruta = float(
-                distancia_lineal * rng.uniform(1.3, 1.6)
-            )
-            distancia_ruta = max(5.0, distancia_ruta)
-
-            # Tipo de ruta geográfica
-            if distancia_ruta < 25 and region_op in ["Ozama", "Cibao Central"]:
-                tipo_ruta_geo = "Urbana Densa"
-            elif distancia_ruta < 50:
-                tipo_ruta_geo = "Urbana Estándar"
-            elif distancia_ruta < 150:
-                tipo_ruta_geo = "Interurbana Regular"
-            else:
-                tipo_ruta_geo = "Autopista"
-
-            vel = VELOCIDAD_PROMEDIO_KMH.get(tipo_ruta_geo, 40.0)
-            tiempo_ida_hrs = round(distancia_ruta / vel, 2)
-
-            # Frecuencia y días de operación
-            frecuencia = random.choices(
-                ["Diaria (L-S)", "Interdiaria (L-M-X)", "Semanal (1 día)"],
-                weights=[0.3, 0.5, 0.2],
-                k=1,
-            )[0]
-
-            if frecuencia == "Diaria (L-S)":
-                dias_visita = "L-M-M-J-V-S"
-            elif frecuencia == "Interdiaria (L-M-X)":
-                dias_visita = random.choice(["L-M-V", "M-J-S", "L-X-V"])
-            else:
-                dias_visita = random.choice(
-                    ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes"]
-                )
-
-            nombre_prov_dest = geo_dest["Nombre_Provincia"]
-            nombre_ruta = (
-                f"Ruta {region_op[:3].upper()}-"
-                f"{str(consecutivo_ruta).zfill(4)}-"
-                f"{nombre_prov_dest}"
-            )
-
-            rutas_data.append(
-                {
-                    "ID_Ruta": f"RUT-{str(consecutivo_ruta).zfill(5)}",
-                    "Nombre_Ruta": nombre_ruta,
-                    "ID_CEDI_Origen": cedi_id,
-                    "Nombre_CEDI_Origen": cedi_nom,
-                    "ID_Provincia_Destino": geo_dest["ID_Provincia"],
-                    "Nombre_Provincia_Destino": nombre_prov_dest,
-                    "Zona_Especifica": f"{fake.city_suffix()} {fake.street_name()}",
-                    "ID_Vehiculo_Asignado": vehiculo["ID_Vehiculo"],
-                    "Marca_Modelo_Vehiculo": vehiculo["Marca_Modelo"],
-                    "ID_Vendedor_Titular": vendedor["Vendedor_ID"],
-                    "Nombre_Vendedor_Titular": vendedor["Nombre_Vendedor"],
-                    "Tipo_Vendedor_Ruta": vendedor["Tipo_Vendedor"],
-                    "Distancia_Ruta_KM": round(distancia_ruta, 2),
-                    "Tiempo_Ruta_Estimado_Hrs": tiempo_ida_hrs,
-                    "Costo_Peaje_Estimado_DOP": float(
-                        random.choices(
-                            [0, 0, 50, 100, 200],
-                            weights=[0.4, 0.2, 0.2, 0.1, 0.1],
-                            k=1,
-                        )[0]
-                    ),
-                    "Frecuencia_Visita": frecuencia,
-                    "Dias_Operacion_Semana": dias_visita,
-                    "Tipo_Ruta_Geografica": tipo_ruta_geo,
-                    "Estado_Ruta": "Activa",
-                }
-            )
-            consecutivo_ruta += 1
-
-    df_ruta = pl.DataFrame(rutas_data)
+        frecuencias = rng.choice(
+            np.array(["Diaria (L-S)", "Interdiaria (L-M-X)", "Semanal (1 día)"], dtype=object),
+            size=N,
+            p=[0.3, 0.5, 0.2],
+        )
+        dias_interdiaria = rng.choice(np.array(["L-M-V", "M-J-S", "L-X-V"], dtype=object), size=N)
+        dias_semanal = rng.choice(
+            np.array(["Lunes", "Martes", "Miércoles", "Jueves", "Viernes"], dtype=object), size=N
+        )
+        dias_visita_arr = np.where(
+            frecuencias == "Diaria (L-S)",
+            "L-M-M-J-V-S",
+            np.where(frecuencias == "Interdiaria (L-M-X)", dias_interdiaria, dias_semanal),
+        )
+        peajes = rng.choice(
+            np.array([0, 0, 50, 100, 200], dtype=np.float64),
+            size=N,
+            p=[0.4, 0.2, 0.2, 0.1, 0.1],
+        )
 
-    df_ruta = df_ruta.with_columns(
-        [
-            pl.col("Distancia_Ruta_KM").cast(pl.Float32),
-            pl.col("Tiempo_Ruta_Estimado_Hrs").cast(pl.Float32),
-            pl.col("Costo_Peaje_Estimado_DOP").cast(pl.Float32),
-        ]
-    )
+        # Tipo de ruta geográfica por tramos de distancia (Urbana Densa solo en Ozama / Cibao Central)
+        idx_tipo = np.digitize(distancias_ruta, TRAMOS_DISTANCIA_RUTA_KM)
+        if region_op not in ("Ozama", "Cibao Central"):
+            idx_tipo = np.maximum(idx_tipo, 1)
+        tipos_ruta = TIPOS_RUTA_GEO[idx_tipo]
+        tiempos_ruta = distancias_ruta / VELOCIDADES_TIPO_RUTA[idx_tipo]
+
+        bloque = {
+            "Prefijo_Region": np.full(N, region_op[:3].upper(), dtype=object),
+            "ID_CEDI_Origen": np.full(N, cedi_id, dtype=object),
+            "Nombre_CEDI_Origen": np.full(N, cedi_nom, dtype=object),
+            "ID_Provincia_Destino": geos_objetivo["ID_Provincia"][idx_g],
+            "Nombre_Provincia_Destino": geos_objetivo["Nombre_Provincia"][idx_g],
+            "Zona_Especifica": np.array(
+                [f"{fake.city_suffix()} {fake.street_name()}" for _ in range(N)], dtype=object
+            ),
+            "ID_Vehiculo_Asignado": vehiculos_disponibles["ID_Vehiculo"][idx_v],
+            "Marca_Modelo_Vehiculo": vehiculos_disponibles["Marca_Modelo"][idx_v],
+            "ID_Vendedor_Titular": vendedores_disponibles["Vendedor_ID"][idx_s],
+            "Nombre_Vendedor_Titular": vendedores_disponibles["Nombre_Vendedor"][idx_s],
+            "Tipo_Vendedor_Ruta": vendedores_disponibles["Tipo_Vendedor"][idx_s],
+            "Distancia_Ruta_KM": np.round(distancias_ruta, 2).astype(np.float32),
+            "Tiempo_Ruta_Estimado_Hrs": np.round(tiempos_ruta, 2).astype(np.float32),
+            "Costo_Peaje_Estimado_DOP": peajes.astype(np.float32),
+            "Frecuencia_Visita": frecuencias,
+            "Dias_Operacion_Semana": dias_visita_arr,
+            "Tipo_Ruta_Geografica": tipos_ruta,
+            "Estado_Ruta": np.full(N, "Activa", dtype=object),
+        }
+        for col, arr in bloque.items():
+            bloques_ruta.setdefault(col, []).append(arr)
+
+    if not bloques_ruta:
+        logger.warning("⚠️ Ningún CEDI tiene vehículos y vendedores asignables. Retornando DimRuta vacía.")
+        return pl.DataFrame(schema=SCHEMAS["DimRuta"]).lazy()
+
+    # IDs y nombres de ruta en bloque sobre el consecutivo global
+    consecutivo = (pl.int_range(pl.len()) + 1).cast(pl.Utf8)
+    df_ruta = pl.DataFrame(
+        {col: np.concatenate(arrs) for col, arrs in bloques_ruta.items()}
+    ).select([
+        pl.format("RUT-{}", consecutivo.str.zfill(5)).alias("ID_Ruta"),
+        pl.format(
+            "Ruta {}-{}-{}",
+            pl.col("Prefijo_Region"),
+            consecutivo.str.zfill(4),
+            pl.col("Nombre_Provincia_Destino"),
+        ).alias("Nombre_Ruta"),
+        pl.all().exclude("Prefijo_Region"),
+    ])
 
+    # Distancia / tiempo / peaje ya son float32 desde los bloques NumPy
     if "DimRuta" in SCHEMAS:
         df_ruta = asegurar_columnas(df_ruta, SCHEMAS["DimRuta"])
-        df_ruta = df_ruta.cast(SCHEMAS["DimRuta"])
+        df_ruta = asegurar_schema(df_ruta, SCHEMAS["DimRuta"])
 
     guardar_parquet(df_ruta, "dim_ruta")
-    return pl.scan_parquet(DIRS["OUTPUT"] / "dim_ruta.parquet")
+    return df_ruta.lazy()
 
 
 
@@ -3452,6 +3670,8 @@ import numpy as np
 import math
 import random
 from datetime import date, timedelta
+from dataclasses import dataclass
+from collections.abc import Mapping
 import gc # Garbage collection
 from tqdm import tqdm
 from geopy.distance import geodesic # Para calcular distancias de rutas
@@ -3480,21 +3700,22 @@ if 'SEED_VAL' not in globals():
     SEED_VAL = 42
 
 if 'SCHEMAS' not in globals():
+    # Llaves foráneas y dominios cerrados como Categorical (un u32 por fila; códigos compartidos vía string cache)
     SCHEMAS = {
         "FactVentas": {
             "ID_Venta_Transaccion": pl.Utf8,
-            "ID_Factura": pl.Utf8,
+            "ID_Factura": pl.Categorical,
             "Fecha_Transaccion": pl.Date,
             "ID_Tiempo": pl.Utf8, # FK a DimTiempo
-            "ID_Cliente": pl.Utf8,
-            "ID_Vendedor": pl.Utf8,
-            "ID_CEDI_Origen": pl.Utf8, # Nuevo: CEDI que despacha
-            "ID_Ruta": pl.Utf8,
-            "ID_Vehiculo": pl.Utf8,
-            "Codigo_Producto_SKU": pl.Utf8,
-            "ID_Promocion": pl.Utf8, # Nuevo: Promoción aplicada
-            "ID_Canal": pl.Utf8, # Nuevo: Canal de venta
-            "ID_Provincia": pl.Utf8, # Nuevo: Provincia de la venta
+            "ID_Cliente": pl.UInt32, # Surrogate entero de DimCliente
+            "ID_Vendedor": pl.Categorical,
+            "ID_CEDI_Origen": pl.Categorical, # Nuevo: CEDI que despacha
+            "ID_Ruta": pl.Categorical,
+            "ID_Vehiculo": pl.Categorical,
+            "Codigo_Producto_SKU": pl.Categorical,
+            "ID_Promocion": pl.Categorical, # Nuevo: Promoción aplicada
+            "ID_Canal": pl.Categorical, # Nuevo: Canal de venta
+            "ID_Provincia": pl.Categorical, # Nuevo: Provincia de la venta
             "Cantidad_Unidades": pl.Int32,
             "Precio_Unitario_DOP": pl.Float32, # Precio antes de descuento
             "Precio_Final_DOP": pl.Float32, # Precio por unidad después de descuento y promoción
@@ -3508,34 +3729,64 @@ if 'SCHEMAS' not in globals():
             "Ingreso_Neto_DOP": pl.Float32, # Total facturado al cliente (después de descuentos, antes de ITBIS)
             "Costo_Venta_Total_DOP": pl.Float32,
             "Margen_Bruto_DOP": pl.Float32,
-            "Tipo_Pago": pl.Utf8,
-            "Medio_Pago": pl.Utf8,
-            "Estado_Factura": pl.Utf8,
+            "Tipo_Pago": pl.Categorical,
+            "Medio_Pago": pl.Categorical,
+            "Estado_Factura": pl.Categorical,
             "Latitud_Entrega": pl.Float32, # Nuevo: Latitud del cliente
             "Longitud_Entrega": pl.Float32, # Nuevo: Longitud del cliente
-            "Tipo_Venta": pl.Utf8, # Nuevo: Preventa, Autoventa, Directa
+            "Tipo_Venta": pl.Categorical, # Nuevo: Preventa, Autoventa, Directa
             "Ticket_Promedio_Cliente": pl.Float32 # Nuevo: Estimación de ticket promedio de ese cliente para la fecha
         }
     }
 
-# Asegurar que las constantes globales para la simulación estén definidas
-# (Estas también deberían venir de celdas anteriores)
-if 'ANOS_SIMULACION' not in globals():
-    ANOS_SIMULACION = [2021, 2022, 2023, 2024, 2025]
-if 'NUM_CLIENTES_POR_ANO' not in globals():
-    NUM_CLIENTES_POR_ANO = {2021: 61_500, 2022: 63_000, 2023: 65_000, 2024: 67_800, 2025: 71_000}
-if 'INGRESOS_POR_ANO_BASE' not in globals(): # Base para generar ventas
-    INGRESOS_POR_ANO_BASE = {2021: 4_638_420_000, 2022: 5_598_080_000, 2023: 6_692_772_000, 2024: 6_966_500_000, 2025: 7_748_490_000} # DOP
-if 'LINEAS_POR_ANO_BASE' not in globals():
-    LINEAS_POR_ANO_BASE = {2021: 7_027_200, 2022: 7_488_000, 2023: 7_488_000, 2024: 7_978_800, 2025: 8_674_000}
-
-# Variables auxiliares que dependen de las anteriores
-TOTAL_TARGET_FACTURAS_UNICAS = sum(LINEAS_POR_ANO_BASE[y] / 3 for y in ANOS_SIMULACION) # Aproximación
+@dataclass(frozen=True, slots=True)
+class SimConfig:
+    """Volúmenes de la simulación resueltos una sola vez (inmutable: sin reconfiguraciones parciales)."""
+    anos: tuple[int, ...]
+    num_clientes: Mapping[int, int]
+    ingresos_base: Mapping[int, int]   # DOP, base para generar ventas
+    lineas_base: Mapping[int, int]
+    itbis: float = 0.18                # 18% de ITBIS en República Dominicana
+
+    @classmethod
+    def default(cls) -> "SimConfig":
+        # Respeta lo definido en celdas anteriores; si esta celda se ejecuta aislada usa los valores base
+        g = globals()
+        return cls(
+            anos=tuple(g.get("ANOS_SIMULACION", (2021, 2022, 2023, 2024, 2025))),
+            num_clientes=MappingProxyType(dict(g.get(
+                "NUM_CLIENTES_POR_ANO",
+                {2021: 61_500, 2022: 63_000, 2023: 65_000, 2024: 67_800, 2025: 71_000},
+            ))),
+            ingresos_base=MappingProxyType(dict(g.get(
+                "INGRESOS_POR_ANO_BASE",
+                {2021: 4_638_420_000, 2022: 5_598_080_000, 2023: 6_692_772_000, 2024: 6_966_500_000, 2025: 7_748_490_000},
+            ))),
+            lineas_base=MappingProxyType(dict(g.get(
+                "LINEAS_POR_ANO_BASE",
+                {2021: 7_027_200, 2022: 7_488_000, 2023: 7_488_000, 2024: 7_978_800, 2025: 8_674_000},
+            ))),
+        )
+
+
+CFG: SimConfig = globals().get("CFG") or SimConfig.default()
+
+# Alias de compatibilidad para los generadores que leen las constantes sueltas
+ANOS_SIMULACION = list(CFG.anos)
+NUM_CLIENTES_POR_ANO = CFG.num_clientes
+INGRESOS_POR_ANO_BASE = CFG.ingresos_base
+LINEAS_POR_ANO_BASE = CFG.lineas_base
+
+# Variables auxiliares que dependen de las anteriores (enteras: sirven para dimensionar arrays)
+TOTAL_TARGET_FACTURAS_UNICAS = sum(LINEAS_POR_ANO_BASE[y] for y in ANOS_SIMULACION) // 3 # Aproximación
 NUM_LINEAS_TOTAL_TARGET = sum(LINEAS_POR_ANO_BASE.values())
-INGRESO_NETO_ESTIMADO_POR_ANO = {y: (INGRESOS_POR_ANO_BASE[y] * 0.95) for y in ANOS_SIMULACION} # 5% de ajuste
+# Solo lectura: evita que código posterior mute los objetivos ya derivados
+INGRESO_NETO_ESTIMADO_POR_ANO = MappingProxyType(
+    {y: round(INGRESOS_POR_ANO_BASE[y] * 0.95) for y in ANOS_SIMULACION} # 5% de ajuste
+)
 
 # Nuevas constantes para FactVentasAvanzada
-ITBIS_GENERAL_PCT = 0.18 # 18% de ITBIS en República Dominicana
+ITBIS_GENERAL_PCT = CFG.itbis
 # Configuración base de años y volúmenes de simulación
 
 
@@ -3550,49 +3801,113 @@ ITBIS_GENERAL_PCT = 0.18 # 18% de ITBIS en República Dominicana
 # (También asumimos que las constantes globales como ANOS_SIMULACION, NUM_CLIENTES_POR_ANO, etc., están definidas)
 
 # Asegurarse que DB_MEMORIA exista
-if 'DB_MEMORIA' not in globals():
-    DB_MEMORIA = {}
+DB_MEMORIA: dict[str, pl.LazyFrame] = globals().get("DB_MEMORIA", {})
+
+# Hilos para el DAG de dimensiones: por defecto un hilo por núcleo (tope 8), configurable por entorno
+MAX_WORKERS_DIMENSIONES = int(os.getenv("SIM_MAX_WORKERS", min(8, os.cpu_count() or 1)))
+
+
+# DAG de dimensiones: nombre -> (generador, dependencias pasadas como argumentos en orden)
+DAG_DIMENSIONES: dict[str, tuple[Callable[..., pl.LazyFrame], list[str]]] = {
+    # 1. Dimensiones Maestras Independientes o de baja dependencia
+    "DimTiempo": (generar_dim_tiempo, []),
+    "DimGeografia": (generar_dim_geografia, []),
+    "DimPlanta": (generar_dim_planta, []),
+    "DimDepartamento": (generar_dim_departamento, []),
+    "DimCanalDistribucion": (generar_dim_canal_distribucion, []),
+    "DimCluster": (generar_dim_cluster, []),
+    "DimPromocion": (generar_dim_promocion, []),
+    "DimProducto": (generar_dim_producto_sku, []), # Asegúrate que genera 'ID_ProductoSKU' y 'Tasa_ISC_Pct', 'Aplica_ISC', 'Factor_Estacionalidad_Categoria'
+    "DimAlmacen": (generar_dim_almacen_planta, ["DimPlanta"]),
+    "DimPuesto": (generar_dim_puesto, ["DimDepartamento"]),
+    # 2. Dimensiones con dependencias iniciales (CEDIs, Empleados)
+    "DimCEDI": (generar_dim_cedi, ["DimGeografia", "DimPlanta"]),
+    "DimEmpleado": (generar_dim_empleado, ["DimDepartamento", "DimPuesto", "DimCEDI", "DimGeografia"]),
+    "DimVendedor": (generar_dim_vendedor, ["DimEmpleado", "DimPuesto", "DimCEDI"]), # Se añadió DimCEDI como dependencia
+    # 3. Dimensiones que dependen de la complejidad anterior
+    "DimCliente": (generar_dim_cliente_masiva, ["DimGeografia", "DimCanalDistribucion", "DimCluster"]),
+    "DimVehiculo": (generar_dim_vehiculo, ["DimCEDI"]),
+    "DimRuta": (generar_dim_ruta, ["DimCEDI", "DimGeografia", "DimVehiculo", "DimVendedor"]), # DimVendedor en lugar de DimEmpleado
+}
+
+# Dependencias solo de orden (no se pasan como argumento): los generadores que usan el Faker
+# compartido corren en el orden original (Empleado -> Cliente -> Ruta) para que la secuencia
+# sembrada de nombres/textos sea reproducible.
+ORDEN_FAKER_DIMENSIONES: dict[str, list[str]] = {
+    "DimCliente": ["DimEmpleado"],
+    "DimRuta": ["DimCliente"],
+}
+
+
+def ejecutar_dag_dimensiones(
+    dag: dict[str, tuple[Callable[..., pl.LazyFrame], list[str]]],
+    orden_extra: dict[str, list[str]],
+    destino: dict[str, pl.LazyFrame],
+) -> dict[str, pl.LazyFrame]:
+    """Lanza cada generador en un hilo apenas sus dependencias están en `destino` (Polars/NumPy liberan el GIL)."""
+    pendientes = dict(dag)
+    en_curso = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS_DIMENSIONES) as pool:
+        while pendientes or en_curso:
+            listos = [
+                nombre for nombre, (_, deps) in pendientes.items()
+                if all(d in destino for d in deps + orden_extra.get(nombre, []))
+            ]
+            for nombre in listos:
+                generador, deps = pendientes.pop(nombre)
+                en_curso[pool.submit(generador, *(destino[d] for d in deps))] = nombre
+
+            if not en_curso:
+                raise RuntimeError(f"❌ Dependencias no resueltas en el DAG de dimensiones: {sorted(pendientes)}")
+
+            terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                destino[en_curso.pop(futuro)] = futuro.result()
+    return destino
+
 
 logger.info("--- 🔨 INICIANDO GENERACIÓN DE DIMENSIONES (GRUPO 1) ---")
 
-# 1. Dimensiones Maestras Independientes o de baja dependencia
-DB_MEMORIA["DimTiempo"] = generar_dim_tiempo()
-DB_MEMORIA["DimGeografia"] = generar_dim_geografia()
-DB_MEMORIA["DimPlanta"] = generar_dim_planta()
-DB_MEMORIA["DimAlmacen"] = generar_dim_almacen_planta(DB_MEMORIA["DimPlanta"])
-DB_MEMORIA["DimDepartamento"] = generar_dim_departamento()
-DB_MEMORIA["DimPuesto"] = generar_dim_puesto(DB_MEMORIA["DimDepartamento"])
-DB_MEMORIA["DimCanalDistribucion"] = generar_dim_canal_distribucion()
-DB_MEMORIA["DimCluster"] = generar_dim_cluster()
-DB_MEMORIA["DimPromocion"] = generar_dim_promocion()
-
-# 2. Dimensiones con dependencias iniciales (CEDIs, Productos, Empleados)
-DB_MEMORIA["DimCEDI"] = generar_dim_cedi(DB_MEMORIA["DimGeografia"], DB_MEMORIA["DimPlanta"])
-DB_MEMORIA["DimProducto"] = generar_dim_producto_sku() # Asegúrate que genera 'ID_ProductoSKU' y 'Tasa_ISC_Pct', 'Aplica_ISC', 'Factor_Estacionalidad_Categoria'
-DB_MEMORIA["DimEmpleado"] = generar_dim_empleado(
-    DB_MEMORIA["DimDepartamento"],
-    DB_MEMORIA["DimPuesto"],
-    DB_MEMORIA["DimCEDI"],
-    DB_MEMORIA["DimGeografia"]
-)
-DB_MEMORIA["DimVendedor"] = generar_dim_vendedor(
-    DB_MEMORIA["DimEmpleado"],
-    DB_MEMORIA["DimPuesto"],
-    DB_MEMORIA["DimCEDI"] # Se añadió esta dependencia en la función
-)
+ejecutar_dag_dimensiones(DAG_DIMENSIONES, ORDEN_FAKER_DIMENSIONES, DB_MEMORIA)
 
-# 3. Dimensiones que dependen de la complejidad anterior
-DB_MEMORIA["DimCliente"] = generar_dim_cliente_masiva(
-    DB_MEMORIA["DimGeografia"],
-    DB_MEMORIA["DimCanalDistribucion"],
-    DB_MEMORIA["DimCluster"]
-)
-DB_MEMORIA["DimVehiculo"] = generar_dim_vehiculo(DB_MEMORIA["DimCEDI"])
-DB_MEMORIA["DimRuta"] = generar_dim_ruta(
-    DB_MEMORIA["DimCEDI"],
-    DB_MEMORIA["DimGeografia"],
-    DB_MEMORIA["DimVehiculo"],
-    DB_MEMORIA["DimVendedor"] # Se cambió de DimEmpleado a DimVendedor directamente
-)
+# Las dimensiones viajan en Float32 (coordenadas, tasas, montos) para abaratar joins con los hechos
+columnas_float64 = {
+    nombre: [col for col, dtype in lf.collect_schema().items() if dtype == pl.Float64]
+    for nombre, lf in DB_MEMORIA.items()
+    if isinstance(lf, pl.LazyFrame)
+}
+columnas_float64 = {nombre: cols for nombre, cols in columnas_float64.items() if cols}
+if columnas_float64:
+    logger.error(f"❌ Columnas Float64 en dimensiones: {columnas_float64}")
+    raise TypeError(f"Columnas Float64 en dimensiones (se esperaba Float32): {columnas_float64}")
+
+
+def persistir_dimensiones_ipc(db: dict[str, pl.LazyFrame]) -> None:
+    """Vuelca cada dimensión a Arrow IPC sin comprimir y la reemplaza por un scan con memory map.
+
+    Las dimensiones frías dejan de ocupar RAM del proceso; el page cache del SO sirve las calientes.
+    """
+    directorio = DIRS["OUTPUT"] / "ipc"
+    directorio.mkdir(parents=True, exist_ok=True)
+
+    def volcar(nombre: str, lf: pl.LazyFrame) -> tuple[str, Path]:
+        ruta = directorio / f"{nombre}.arrow"
+        lf.collect().write_ipc(ruta, compression="uncompressed")
+        return nombre, ruta
+
+    # Dos hilos bastan: mientras uno escribe a disco (sin GIL) el otro materializa la siguiente dimensión
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futuros = [
+            pool.submit(volcar, nombre, lf)
+            for nombre, lf in db.items()
+            if isinstance(lf, pl.LazyFrame)
+        ]
+        for futuro in futuros:
+            nombre, ruta = futuro.result()
+            db[nombre] = pl.scan_ipc(ruta, memory_map=True)
+    gc.collect()
+
+
+persistir_dimensiones_ipc(DB_MEMORIA)
 
 logger.info("✅ GRUPO 1 COMPLETADO: Todas las dimensiones base para FactVentas generadas y persistidas.")